@@ -0,0 +1,107 @@
+#! /usr/bin/python3
+
+# DiskCache.py
+
+import os
+import pickle
+
+class DiskCache(object):
+	"""Persistent cache of pickled values in a directory.
+
+		Every value is stored in its own file named by its key, usually a
+		content hash of the inputs it was derived from (see digest). Files
+		are written atomically, so concurrent processes, e.g. the workers of
+		a sweep, can share a cache directory. Reading a value updates the
+		modification time of its file; when the total size exceeds max_size,
+		the least recently used files are removed.
+
+	Attributes:
+		path (str)		: cache directory
+		max_size (int)	: max. total size of the cached files in bytes
+	"""
+	def __init__(self, path, max_size=256 * 2**20):
+		self.path = path
+		self.max_size = max_size
+		self.size = None
+		os.makedirs(path, exist_ok=True)
+
+	def get(self, key, default=None):
+		"""Cached value of a key, default if the key is not cached"""
+		file = self.file(key)
+		try:
+			with open(file, 'rb') as f:
+				value = pickle.load(f)
+		except FileNotFoundError:
+			return default
+		except Exception:
+			# unreadable, e.g. written by an incompatible version
+			self.remove(file)
+			return default
+		try:
+			os.utime(file)
+		except OSError:
+			pass
+		return value
+
+	def set(self, key, value):
+		"""Stores a value and evicts the least recently used values if necessary"""
+		file = self.file(key)
+		tmp = '{}.{}.tmp'.format(file, os.getpid())
+		with open(tmp, 'wb') as f:
+			pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tmp, file)
+
+		if self.size is None:
+			self.size = sum(size for _, _, size in self.entries())
+		else:
+			self.size += os.path.getsize(file)
+		if self.size > self.max_size:
+			self.evict()
+
+	def get_or_compute(self, key, fct):
+		"""Cached value of a key, computed by fct() and stored on a miss"""
+		missing = object()
+		value = self.get(key, missing)
+		if value is missing:
+			value = fct()
+			self.set(key, value)
+		return value
+
+	def evict(self):
+		"""Removes the least recently used files until the size limit is met"""
+		entries = sorted(self.entries())
+		self.size = sum(size for _, _, size in entries)
+		for _, file, size in entries:
+			if self.size <= self.max_size:
+				break
+			self.remove(file)
+			self.size -= size
+
+	def clear(self):
+		"""Removes all cached values"""
+		for _, file, _ in self.entries():
+			self.remove(file)
+		self.size = 0
+
+	def entries(self):
+		"""Modification time, path and size of every cached file"""
+		entries = []
+		for name in os.listdir(self.path):
+			if not name.endswith('.pkl'):
+				continue
+			file = os.path.join(self.path, name)
+			try:
+				stat = os.stat(file)
+			except OSError:
+				continue
+			entries.append((stat.st_mtime, file, stat.st_size))
+		return entries
+
+	def file(self, key):
+		return os.path.join(self.path, key + '.pkl')
+
+	def remove(self, file):
+		try:
+			os.remove(file)
+		except OSError:
+			pass
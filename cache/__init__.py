@@ -0,0 +1,3 @@
+from .DiskCache import DiskCache
+from .digest import digest
+from .default_cache import enable, disable, get_cache, cached
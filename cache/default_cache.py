@@ -0,0 +1,57 @@
+#! /usr/bin/python3
+
+# default_cache.py
+
+import os
+
+from .DiskCache import DiskCache
+from .digest import digest
+
+# process-wide cache, disabled unless enable is called
+default = None
+
+def enable(path=None, max_size=256 * 2**20):
+	"""Enables the process-wide cache of derived values.
+
+		Compiled models, planner coefficients and tabulated trajectories are
+		then loaded from the cache directory if they were derived from the
+		same inputs before.
+
+	Args:
+		path (str)		: cache directory, defaults to $PYTHON_CONTROL_CACHE
+						  or ~/.cache/python-control
+		max_size (int)	: max. size of the cache in bytes
+
+	Returns:
+		DiskCache
+	"""
+	global default
+	if path is None:
+		path = os.environ.get('PYTHON_CONTROL_CACHE',
+			os.path.join(os.path.expanduser('~'), '.cache', 'python-control'))
+	default = DiskCache(path, max_size)
+	return default
+
+def disable():
+	"""Disables the process-wide cache"""
+	global default
+	default = None
+
+def get_cache():
+	"""Process-wide cache, None if disabled"""
+	return default
+
+def cached(name, inputs, fct):
+	"""Value fct() derived from inputs, loaded from the process-wide cache if enabled.
+
+	Args:
+		name (str)		: name of the derivation, part of the key
+		inputs (tuple)	: all inputs that determine the value
+		fct				: computes the value
+
+	Returns:
+		value
+	"""
+	if default is None:
+		return fct()
+	return default.get_or_compute(digest(name, *inputs), fct)
@@ -0,0 +1,60 @@
+#! /usr/bin/python3
+
+# digest.py
+
+import sys
+import hashlib
+
+import numpy as np
+
+# changes of the cached data invalidate all keys
+VERSION = 1
+
+def digest(*parts):
+	"""Content hash of the inputs of a derived value.
+
+		Arrays are hashed by dtype, shape and data, sympy expressions by
+		their structure and other objects, e.g. planners or parameters, by
+		their type and attributes.
+
+	Args:
+		parts		: values to hash
+
+	Returns:
+		key (str)	: hex encoded sha256 hash
+	"""
+	h = hashlib.sha256()
+	update(h, (VERSION,) + parts)
+	return h.hexdigest()
+
+def update(h, value):
+	"""Feeds a value into the hash h"""
+	# sympy is only inspected if it was imported by the caller
+	sympy = sys.modules.get('sympy')
+
+	if value is None or isinstance(value, (bool, int, float, complex, str)):
+		h.update(b'v' + type(value).__name__.encode() + repr(value).encode() + b';')
+	elif isinstance(value, bytes):
+		h.update(b'b' + str(len(value)).encode() + b';' + value)
+	elif isinstance(value, (np.ndarray, np.generic)):
+		value = np.ascontiguousarray(value)
+		h.update(b'a' + value.dtype.str.encode() + str(value.shape).encode() + b';')
+		h.update(value.tobytes())
+	elif isinstance(value, (list, tuple)):
+		h.update(b'l' + str(len(value)).encode() + b';')
+		for item in value:
+			update(h, item)
+	elif isinstance(value, dict):
+		h.update(b'd' + str(len(value)).encode() + b';')
+		for key in sorted(value, key=repr):
+			update(h, key)
+			update(h, value[key])
+	elif sympy is not None and isinstance(value, (sympy.Basic, sympy.MatrixBase)):
+		h.update(b's' + sympy.srepr(value).encode() + b';')
+	elif callable(value) and hasattr(value, '__qualname__'):
+		h.update(b'f' + '{}.{}'.format(value.__module__, value.__qualname__).encode() + b';')
+	elif hasattr(value, '__dict__'):
+		h.update(b'o' + '{}.{}'.format(type(value).__module__, type(value).__qualname__).encode() + b';')
+		update(h, vars(value))
+	else:
+		h.update(b'r' + repr(value).encode() + b';')
@@ -23,6 +23,9 @@ class Car(Model):
 			u1 : velocity of the car
 			u2 : steering angle of the front wheels
 	"""
+	# all state derivatives depend on u1, so the closed loop Jacobian of a
+	# feedback law is dense
+	jac_sparsity = np.ones([3, 3], dtype=bool)
 	
 	# Overridden
 	def ode(self, t, x):
@@ -37,7 +40,22 @@ class Car(Model):
 		
 		Args:
 			t		: time
-			x 		: state
+			x 		: state, or block of states (size = (3, N))
+			
+		Returns:
+			dxdt	: state derivative
+		"""
+		u = np.transpose(self.controller.control(t, x))
+		return self.dynamics(t, x, u)
+		
+	# Overridden
+	def dynamics(self, t, x, u):
+		"""Dynamics of the car for a given input.
+		
+		Args:
+			t		: time
+			x 		: state, or block of states (size = (3, N))
+			u		: input, or block of inputs (size = (2, N))
 			
 		Returns:
 			dxdt	: state derivative
@@ -45,7 +63,7 @@ class Car(Model):
 		params = self.params
 		
 		x1, x2, x3 = x
-		u1, u2 = self.controller.control(t, x)
+		u1, u2 = u
 		
 		dxdt = np.array([ 	u1 * cos(x3),
 							u1 * sin(x3),
@@ -53,6 +71,49 @@ class Car(Model):
 							
 		return dxdt
 		
+	# Overridden
+	def jac(self, t, x):
+		"""Jacobian of the closed loop dynamics.
+		
+			df/dx = A + B * du/dx with the linearization A, B of the
+			dynamics and the state dependence du/dx of the controller.
+		
+		Args:
+			t		: time
+			x 		: state
+			
+		Returns:
+			dfdx	: Jacobian (size = (3, 3))
+		"""
+		u = self.controller.control(t, x)
+		A, B = self.linearize(t, x, u)
+		return A + np.dot(B, self.controller.control_jac(t, x))
+		
+	def linearize(self, t, x, u):
+		"""Linearization of the dynamics around a state and input.
+		
+		Args:
+			t		: time
+			x 		: state
+			u		: input
+			
+		Returns:
+			A		: derivative w.r.t. the state (size = (3, 3))
+			B		: derivative w.r.t. the input (size = (3, 2))
+		"""
+		params = self.params
+		
+		x1, x2, x3 = x
+		u1, u2 = u
+		
+		A = np.array([[0, 0, -u1 * sin(x3)],
+					  [0, 0, u1 * cos(x3)],
+					  [0, 0, 0]])
+		B = np.array([[cos(x3), 0],
+					  [sin(x3), 0],
+					  [1 / params.l * tan(u2), 1 / params.l * u1 / cos(u2)**2]])
+		return A, B
+		
 	def set_params(self, l):
 		self.params.l = l
 		self.params.w = l * 0.3
\ No newline at end of file
@@ -7,7 +7,14 @@ from abc import ABC, abstractmethod
 import numpy as np
 
 class BaseController(ABC):
-	"""Controller for a dynamical system."""
+	"""Controller for a dynamical system.
+	
+		Controllers whose control law accepts a vector of times together
+		with the states stacked row-wise (size = (T, n)) set vectorized.
+		They return one row of inputs per time (size = (T, m)), see states.
+	"""
+	vectorized = False
+	
 	def __init__(self, params=None):
 		self.params = params
 	
@@ -21,4 +28,52 @@ class BaseController(ABC):
 		Returns:
 			u	: control vector
 		"""
-		pass
\ No newline at end of file
+		pass
+		
+	def states(self, t, x):
+		"""State components for the control law.
+		
+			The control law is called with a single state, a block of states
+			(size = (n, N)) at a common time t or with sampled states
+			(size = (T, n)) at the times t. In all cases the first index of
+			the result selects the component of the state.
+		
+		Args:
+			t		: time or time vector (size = T)
+			x		: state vector, block of states or sampled states
+			
+		Returns:
+			x		: state components (size = n, (n, N) or (n, T))
+		"""
+		if np.ndim(t) > 0:
+			return np.transpose(x)
+		return x
+		
+	def stack_inputs(self, t, x, *u):
+		"""Stacks the input components to one row per time or member.
+		
+			Components that only depend on the time, e.g. of a feed-forward
+			law, are broadcast to all members of a block of states.
+		
+		Args:
+			t		: time or time vector (size = T)
+			x		: state vector, block of states or sampled states
+			u		: input components, scalars or arrays
+			
+		Returns:
+			u		: control vector (size = m, (N, m) or (T, m))
+		"""
+		shape = np.shape(x)[1:] if np.ndim(t) == 0 else np.shape(t)
+		return np.array(np.broadcast_arrays(*u, np.empty(shape))[:-1]).T
+		
+	def control_jac(self, t, x):
+		"""Derivative of the control law with respect to the state.
+		
+		Args:
+			t		: time
+			x		: state vector
+			
+		Returns:
+			dudx	: Jacobian of the control vector (size = (m, n))
+		"""
+		raise NotImplementedError('{} does not provide the derivative of its control law.'.format(type(self).__name__))
\ No newline at end of file
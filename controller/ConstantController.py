@@ -12,17 +12,19 @@ class ConstantController(BaseController):
 			u1 : velocity of the car
 			u2 : steering angle of the front wheels
 	"""
+	vectorized = True
 	
 	# Overridden
 	def control(self, t, x, params=None):
 		"""Function of the control law.
 		
 		Args:
-			x (ndarray, int): state vector
-			t (int): time
+			x (ndarray): state vector, block of states (size = (3, N)) or
+				sampled states (size = (T, 3))
+			t (int, ndarray): time or time vector (size = T)
 			
 		Returns:
-			u		: control vector
+			u		: control vector, one row per time or member
 		"""
 		super().control(t, x)
 		
@@ -30,6 +32,20 @@ class ConstantController(BaseController):
 		u1 = np.maximum(0, 1.0 - 0.1 * t)
 		
 		# Constant steering angle
-		u2 = np.full(u1.shape, 0.25)
+		u2 = 0.25
+		
+		return self.stack_inputs(t, x, u1, u2)
 		
-		return np.array([u1, u2]).T
\ No newline at end of file
+	# Overridden
+	def control_jac(self, t, x):
+		"""Derivative of the control law with respect to the state, which
+			vanishes since the inputs only depend on time.
+		
+		Args:
+			x (ndarray, int): state vector
+			t (int): time
+			
+		Returns:
+			dudx	: Jacobian of the control vector (size = (2, 3))
+		"""
+		return np.zeros([2, len(x)])
\ No newline at end of file
@@ -3,9 +3,9 @@
 # FeedForwardController.py
 
 import numpy as np
-from numpy import sqrt, arctan2 
 
 from .BaseController import BaseController
+from .FlatTrajectory import FlatTrajectory
 
 class FeedForwardController(BaseController):
 	"""Controller for the dynamical system of a car.
@@ -14,32 +14,52 @@ class FeedForwardController(BaseController):
 			u1 : velocity of the car
 			u2 : steering angle of the front wheels
 	"""
+	vectorized = True
+	
 	def __init__(self, flo, params):
+		"""
+		Args:
+			flo	: planners (flo_f, flo_g) or their FlatTrajectory
+			params	: car parameters
+		"""
 		super().__init__(params)
-		self.flo = flo
+		if isinstance(flo, FlatTrajectory):
+			self.ref = flo
+		else:
+			self.ref = FlatTrajectory(flo, params)
+		self.flo = (self.ref.flo_f, self.ref.flo_g)
 	
 	# Overridden
 	def control(self, t, x):
 		"""Function of the control law.
 		
 		Args:
-			x (ndarray, int): state vector
-			t (int): time
+			x (ndarray): state vector, block of states (size = (3, N)) or
+				sampled states (size = (T, 3))
+			t (int, ndarray): time or time vector (size = T)
 			
 		Returns:
-			u		: control vector
+			u		: control vector, one row per time or member
 		"""
 		super().control(t, x)
 		
-		params = self.params
-		flo_f, flo_g = self.flo
-
-		# evaluate the planned trajectories at time t
-		flo_g_t = flo_g.eval(t) # y1 = g(t)
-		flo_f_t = flo_f.eval(flo_g_t[0]) # y2 = f(y1) = f(g(t))
+		# evaluate the reference at time t
+		ref = self.ref.eval(t)
 
 		# setting control laws
-		u1 = flo_g_t[1] * sqrt(1 + flo_f_t[1]**2)
-		u2 = arctan2(params.l * flo_f_t[2], (1 + flo_f_t[1]**2)**(3/2))
-
-		return np.array([u1, u2]).T
\ No newline at end of file
+		u = self.ref.inputs(ref)
+		return self.stack_inputs(t, x, u[..., 0], u[..., 1])
+		
+	# Overridden
+	def control_jac(self, t, x):
+		"""Derivative of the control law with respect to the state, which
+			vanishes since the inputs only depend on time.
+		
+		Args:
+			x (ndarray, int): state vector
+			t (int): time
+			
+		Returns:
+			dudx	: Jacobian of the control vector (size = (2, 3))
+		"""
+		return np.zeros([2, len(x)])
\ No newline at end of file
@@ -6,6 +6,7 @@ import numpy as np
 from numpy import sqrt, arctan2, sin 
 
 from .BaseController import BaseController
+from .FlatTrajectory import FlatTrajectory
 
 class FeedbackController(BaseController):
 	"""Controller for the dynamical system of a car.
@@ -14,52 +15,96 @@ class FeedbackController(BaseController):
 			u1 : velocity of the car
 			u2 : steering angle of the front wheels
 	"""
+	vectorized = True
+	
 	def __init__(self, flo, params):
+		"""
+		Args:
+			flo	: planners (flo_f, flo_g) or their FlatTrajectory
+			params	: car and controller parameters
+		"""
 		super().__init__(params)
-		self.flo = flo
+		if isinstance(flo, FlatTrajectory):
+			self.ref = flo
+		else:
+			self.ref = FlatTrajectory(flo, params)
+		self.flo = (self.ref.flo_f, self.ref.flo_g)
 	
 	# Overridden
 	def control(self, t, x):
 		"""Function of the control law.
 		
 		Args:
-			x (ndarray, int): state vector
-			t (int): time
+			x (ndarray): state vector, block of states (size = (3, N)) or
+				sampled states (size = (T, 3))
+			t (int, ndarray): time or time vector (size = T)
 			
 		Returns:
-			u		: control vector
+			u		: control vector, one row per time or member
 		"""
 		super().control(t, x)
 		
 		params = self.params
-		flo_f, flo_g = self.flo
 
-		# evaluate the planned trajectories at time t
-		flo_g_t = flo_g.eval(t) # y1 = g(t)
-		flo_f_t = flo_f.eval(flo_g_t[0]) # y2 = f(y1) = f(g(t))
+		# evaluate the reference at time t
+		ref = self.ref.eval(t)
 		
 		# state vector
-		y1 = x[0]
-		y2 = x[1]
-		theta = x[2]
+		y1, y2, theta = self.states(t, x)
 		y2_d = sin(theta)
 		
 		# define reference trajectories
-		y1_des = flo_g_t[0]
-		y1_des_d = 1 / (np.sqrt(1 + flo_f_t[1] ** 2))
+		y1_des = ref[..., FlatTrajectory.Y1]
+		y1_des_d = ref[..., FlatTrajectory.Y1_D]
 
-		y2_des = flo_f_t[0]
-		y2_des_d = flo_f_t[1] / (np.sqrt(1 + flo_f_t[1] ** 2))
-		y2_des_dd = flo_f_t[2]/(1 + flo_f_t[1] ** 2)
+		y2_des = ref[..., FlatTrajectory.Y2]
+		y2_des_d = ref[..., FlatTrajectory.Y2_D]
+		y2_des_dd = ref[..., FlatTrajectory.Y2_DD]
 		
 		# stabilizing inputs
 		w1 = y1_des_d - params.k01 * (y1 - y1_des)
 		w2 = y2_des_dd - params.k12 * (y2_d - y2_des_d) - params.k02 * (y2 - y2_des)
 
 		# setting control laws
-		v_des = flo_g_t[1] * np.sqrt(1 + (flo_f_t[1]) ** 2) #desired velocity
+		v_des = ref[..., FlatTrajectory.U1] #desired velocity
 		
 		u1 = v_des * np.sqrt( w1**2 + y2_d**2)
 		u2 = arctan2 (0.9 * params.l * (w2 * w1), 1)
 
-		return np.array([u1, u2]).T
\ No newline at end of file
+		return np.array([u1, u2]).T
+		
+	# Overridden
+	def control_jac(self, t, x):
+		"""Derivative of the control law with respect to the state.
+		
+		Args:
+			x (ndarray, int): state vector
+			t (int): time
+			
+		Returns:
+			dudx	: Jacobian of the control vector (size = (2, 3))
+		"""
+		params = self.params
+		ref = self.ref.eval(t)
+		
+		y1, y2, theta = x
+		y2_d = sin(theta)
+		
+		w1 = ref[FlatTrajectory.Y1_D] - params.k01 * (y1 - ref[FlatTrajectory.Y1])
+		w2 = ref[FlatTrajectory.Y2_DD] - params.k12 * (y2_d - ref[FlatTrajectory.Y2_D]) - params.k02 * (y2 - ref[FlatTrajectory.Y2])
+		v_des = ref[FlatTrajectory.U1]
+		
+		# derivatives of the stabilizing inputs and of y2_d
+		dw1 = np.array([-params.k01, 0, 0])
+		dw2 = np.array([0, -params.k02, -params.k12 * np.cos(theta)])
+		dy2_d = np.array([0, 0, np.cos(theta)])
+		
+		# u1 = v_des * sqrt(w1^2 + y2_d^2)
+		r = np.sqrt(w1**2 + y2_d**2)
+		du1 = v_des / r * (w1 * dw1 + y2_d * dy2_d) if r > 0 else np.zeros([3])
+		
+		# u2 = arctan(a) with a = 0.9 * l * w2 * w1
+		a = 0.9 * params.l * w2 * w1
+		du2 = 0.9 * params.l * (w2 * dw1 + w1 * dw2) / (1 + a**2)
+		
+		return np.array([du1, du2])
\ No newline at end of file
@@ -0,0 +1,134 @@
+#! /usr/bin/python3
+
+# FlatTrajectory.py
+
+import numpy as np
+from numpy import sqrt, arctan
+
+from cache import cached
+
+def interpolate(table, slope, t0, tf, dt, t):
+	"""Linear interpolation of a table on a uniform time grid.
+	
+	Args:
+		table (ndarray): rows at the times t0 + k * dt (size = (T, n))
+		slope (ndarray): differences of consecutive rows (size = (T - 1, n))
+		t0, tf (float): times of the first and the last row
+		dt (float): spacing of the rows
+		t (int, float, ndarray): time or time vector
+		
+	Returns:
+		row (ndarray): interpolated row (size = n), or one row per time;
+			constant beyond the ends of the table
+	"""
+	u = (np.clip(t, t0, tf) - t0) / dt
+	k = np.minimum(np.floor(u).astype(int), len(table) - 2)
+	s = np.asarray(u - k)[..., np.newaxis]
+	return table[k] + s * slope[k]
+
+class FlatTrajectory(object):
+	"""Reference trajectory of the car along the path y2 = f(y1), which is
+		traversed in time as y1 = g(t).
+		
+		The planned path f and timing g are composed once per query, including
+		the chain-rule terms. Each reference sample holds the columns
+			Y1, Y2, THETA		: desired state
+			Y1_D, Y2_D, Y2_DD	: desired derivatives used by the feedback law
+			U1					: feed-forward velocity
+			KAPPA				: curvature of the path
+		
+		The reference does not depend on the car, the feed-forward steering
+		angle follows from the curvature and the length l in inputs(), so l
+		may also hold one value per member of an ensemble.
+		
+		After tabulate() the reference is precomputed on a uniform time grid
+		and queries only index (and linearly interpolate) the stored table.
+		If the cache is enabled, the table is loaded from it.
+	"""
+	Y1, Y2, THETA, Y1_D, Y2_D, Y2_DD, U1, KAPPA = range(8)
+	
+	def __init__(self, flo, params):
+		"""
+		Args:
+			flo (tuple): path planner f and timing planner g
+			params (Parameters): car parameters, inputs() uses the length l
+		"""
+		self.flo_f, self.flo_g = flo
+		self.params = params
+		self.table = None
+	
+	def eval(self, t):
+		"""Evaluates the reference at time t.
+		
+		Args:
+			t (int, float, ndarray): time or time vector
+			
+		Returns:
+			ref (ndarray): reference sample (size = 8), or one row per time
+		"""
+		if self.table is None:
+			if np.ndim(t) == 0:
+				return self.compose(self.flo_g.eval(t))
+			return self.compose(self.flo_g.eval_vec(t))
+		
+		return interpolate(self.table, self.slope, self.t0, self.tf, self.dt, t)
+	
+	def compose(self, flo_g_t):
+		"""Composes the reference from samples of the timing planner.
+		
+		Args:
+			flo_g_t (ndarray): y1 = g(t) and its derivatives, one row per time
+			
+		Returns:
+			ref (ndarray): reference samples
+		"""
+		# y2 = f(y1) = f(g(t))
+		if np.ndim(flo_g_t) == 1:
+			flo_f_t = self.flo_f.eval(flo_g_t[0])
+		else:
+			flo_f_t = self.flo_f.eval_vec(flo_g_t[:, 0])
+		
+		g, g_d = flo_g_t[..., 0], flo_g_t[..., 1]
+		f, f_d, f_dd = flo_f_t[..., 0], flo_f_t[..., 1], flo_f_t[..., 2]
+		q = 1 + f_d ** 2
+		
+		ref = np.empty(np.shape(g) + (8,))
+		ref[..., self.Y1] = g
+		ref[..., self.Y2] = f
+		ref[..., self.THETA] = arctan(f_d)
+		ref[..., self.Y1_D] = 1 / sqrt(q)
+		ref[..., self.Y2_D] = f_d / sqrt(q)
+		ref[..., self.Y2_DD] = f_dd / q
+		ref[..., self.U1] = g_d * sqrt(q)
+		ref[..., self.KAPPA] = f_dd / q ** (3/2)
+		return ref
+	
+	def inputs(self, ref):
+		"""Feed-forward inputs of reference samples.
+		
+		Args:
+			ref (ndarray): reference sample (size = 8), or one row per time
+			
+		Returns:
+			u (ndarray): velocity and steering angle (size = 2), one row per
+				time, or one row per member if the length l is an array
+		"""
+		u1 = ref[..., self.U1]
+		u2 = arctan(self.params.l * ref[..., self.KAPPA])
+		return np.array(np.broadcast_arrays(u1, u2)).T
+	
+	def tabulate(self, t0, tf, dt):
+		"""Precomputes the reference on a uniform time grid.
+		
+		Args:
+			t0 (int, float): first grid point
+			tf (int, float): last grid point
+			dt (float): grid spacing, bounds the linear interpolation error by O(dt^2)
+		"""
+		n = int(np.ceil((tf - t0) / dt - 1e-9)) + 1
+		self.t0 = t0
+		self.dt = (tf - t0) / (n - 1)
+		self.tf = tf
+		self.table = cached('FlatTrajectory.tabulate', (self.flo_f, self.flo_g, t0, tf, n),
+			lambda : self.compose(self.flo_g.eval_vec(np.linspace(t0, tf, n))))
+		self.slope = np.diff(self.table, axis=0)
@@ -0,0 +1,177 @@
+#! /usr/bin/python3
+
+# GainTuner.py
+
+import copy
+
+import numpy as np
+
+from .FeedbackController import FeedbackController
+from .FlatTrajectory import FlatTrajectory
+
+class GainTuner(object):
+	"""Tuning of the gains k01, k02 and k12 of a FeedbackController.
+
+		The cost of a set of gains is the tracking error of the closed loop
+		along the reference,
+			J = int_t0^tf sum_i q_i (x_i - x_i,des)^2 + rho * s(u) dt,
+		with the penalty s(u) of the inputs beyond their saturation limits.
+
+		A population of candidate gains is rolled out as one ensemble by
+		EnsembleSimulation, with one gain value per member and the cost
+		integrated as an additional state. Since the cost only grows along
+		a rollout, a terminal event drops candidates from the ensemble as
+		soon as their cost exceeds the best complete cost found so far.
+		The rollouts share a tabulated copy of the reference, the reference
+		of the controller itself is left unchanged.
+
+	Attributes:
+		GAINS (tuple)	: names of the tuned gains
+		history (list)	: mean gains and best cost of every iteration
+	"""
+	GAINS = ('k01', 'k02', 'k12')
+
+	def __init__(self, model, sim_params, weights=(1, 1, 0), u_max=None, rho=10, substeps=1):
+		"""
+		Args:
+			model (Car)			: model with a FeedbackController
+			sim_params			: t0, tf, dt and x0 of the rollouts
+			weights (tuple)		: weights of the errors of y1, y2 and theta
+			u_max (tuple)		: optional saturation limits of |u1| and |u2|
+			rho (float)			: weight of the saturation penalty
+			substeps (int)		: Runge-Kutta steps per step dt
+		"""
+		# the simulation package is only needed for tuning
+		from sim import EnsembleSimulation
+
+		if not isinstance(model.controller, FeedbackController):
+			raise ValueError('GainTuner requires a FeedbackController.')
+
+		self.model = model
+		self.controller = model.controller
+		self.t0 = sim_params.t0
+		self.tf = sim_params.tf
+		self.x0 = np.asarray(sim_params.x0, dtype=float)
+		self.weights = np.asarray(weights, dtype=float)
+		self.u_max = None if u_max is None else np.asarray(u_max, dtype=float)
+		self.rho = rho
+		self.history = []
+
+		self.sim = EnsembleSimulation(sim_params, substeps)
+
+		# shared reference, evaluated by a table lookup in every rollout
+		self.ref = copy.copy(self.controller.ref)
+		if self.ref.table is None:
+			self.ref.tabulate(self.t0, self.tf, sim_params.dt / (2 * substeps))
+
+	def cost(self, K, incumbent=np.inf):
+		"""Closed loop costs of a population of gains.
+
+		Args:
+			K (ndarray)			: gains k01, k02, k12 (size = (N, 3))
+			incumbent (float)	: rollouts stop once their cost exceeds it
+
+		Returns:
+			J (ndarray)	: costs (size = N); for stopped rollouts the cost
+						  extrapolated from the time t_s at which it exceeded
+						  the incumbent, incumbent * (tf - t0) / (t_s - t0),
+						  inf if the rollout diverged
+		"""
+		from sim import named_event
+
+		K = np.atleast_2d(np.asarray(K, dtype=float))
+		N = len(K)
+		params = self.controller.params
+		saved = {name: getattr(params, name) for name in self.GAINS if hasattr(params, name)}
+		ref = self.controller.ref
+
+		def ode(t, Z):
+			X = Z[0:3]
+			U = np.transpose(self.controller.control(t, X))
+			return np.vstack([self.model.dynamics(t, X, U), self.integrand(t, X, U)])
+
+		def exceeded(t, Z):
+			# NaN costs of diverged rollouts are dropped as well
+			g = Z[3] - incumbent
+			return np.where(np.isnan(g), np.inf, g)
+
+		exceeded = named_event(exceeded, 'incumbent_exceeded', terminal=True, direction=1)
+
+		self.sim.x0 = np.hstack([np.repeat(self.x0[np.newaxis], N, axis=0), np.zeros([N, 1])])
+		try:
+			self.controller.ref = self.ref
+			self.set_gains(K)
+			tt, zz = self.sim.simulate(ode, [exceeded], params)
+		finally:
+			self.controller.ref = ref
+			for name in self.GAINS:
+				if name in saved:
+					setattr(params, name, saved[name])
+				else:
+					delattr(params, name)
+
+		J = zz[:, -1, 3]
+		t_stop = self.sim.t_events['incumbent_exceeded']
+		J_stop = self.sim.x_events['incumbent_exceeded'][:, 3]
+		J[self.sim.m_events['incumbent_exceeded']] = np.where(np.isnan(J_stop), np.inf,
+			incumbent * (self.tf - self.t0) / (t_stop - self.t0))
+		return J
+
+	def integrand(self, t, X, U):
+		"""Weighted tracking error and saturation penalty of blocks of states and inputs"""
+		ref = self.controller.ref.eval(t)
+		E = X - ref[[FlatTrajectory.Y1, FlatTrajectory.Y2, FlatTrajectory.THETA], np.newaxis]
+		g = np.dot(self.weights, E**2)
+
+		if self.u_max is not None:
+			excess = np.maximum(np.abs(U) - self.u_max[:, np.newaxis], 0)
+			g = g + self.rho * np.sum(excess**2, axis=0)
+		return g
+
+	def set_gains(self, K):
+		for k in range(0, len(self.GAINS)):
+			setattr(self.controller.params, self.GAINS[k], K[:, k])
+
+	def optimize(self, k0, sigma0=0.5, population=32, elite=0.25, iterations=20, smoothing=0.7, seed=0):
+		"""Minimizes the cost by the cross-entropy method.
+
+			The gains are sampled from a log-normal distribution, so they
+			stay positive. After every iteration the distribution is moved
+			towards the best candidates of the population.
+
+		Args:
+			k0 (tuple)			: initial gains k01, k02, k12
+			sigma0 (float)		: initial standard deviation of the log gains
+			population (int)	: candidates per iteration
+			elite (float)		: fraction of the candidates the distribution is fitted to
+			iterations (int)	: number of iterations
+			smoothing (float)	: weight of the fitted distribution in the update
+			seed (int)			: seed of the random numbers
+
+		Returns:
+			gains (dict)	: best gains k01, k02, k12
+			cost (float)	: cost of the best gains
+		"""
+		rng = np.random.default_rng(seed)
+		n_elite = max(int(round(elite * population)), 2)
+
+		best_K = np.asarray(k0, dtype=float)
+		best_cost = self.cost(best_K[np.newaxis])[0]
+
+		mu = np.log(best_K)
+		sigma = np.full(len(mu), sigma0)
+		self.history = []
+		for i in range(0, iterations):
+			K = np.exp(mu + sigma * rng.standard_normal([population, len(mu)]))
+			J = self.cost(K, best_cost)
+
+			k = np.argmin(J)
+			if J[k] < best_cost:
+				best_K, best_cost = K[k], J[k]
+
+			logK = np.log(K[np.argsort(J)[:n_elite]])
+			mu = smoothing * logK.mean(axis=0) + (1 - smoothing) * mu
+			sigma = smoothing * logK.std(axis=0) + (1 - smoothing) * sigma
+			self.history.append((np.exp(mu), best_cost))
+
+		return dict(zip(self.GAINS, best_K.tolist())), float(best_cost)
@@ -0,0 +1,144 @@
+#! /usr/bin/python3
+
+# LQRController.py
+
+import numpy as np
+import scipy.integrate as sci
+
+from .BaseController import BaseController
+from .FlatTrajectory import FlatTrajectory, interpolate
+
+class LQRController(BaseController):
+	"""Time-varying LQR tracking controller for the dynamical system of a car.
+
+		The model is linearized along the reference of the planners,
+			d/dt dx = A(t) dx + B(t) du,
+		and the Riccati equation
+			-dP/dt = A'P + PA - PBR^-1B'P + Q,	P(tf) = Qf
+		is integrated backwards once. The reference states, the reference
+		inputs and the gains K = R^-1B'P are stored in one table on a uniform
+		time grid, so the control law
+			u = u_ref(t) - K(t) (x - x_ref(t))
+		only interpolates a table row and computes one matrix-vector product.
+
+		The controller outputs are
+			u1 : velocity of the car
+			u2 : steering angle of the front wheels
+	"""
+	vectorized = True
+
+	# columns of the table
+	X_REF = slice(0, 3)
+	U_REF = slice(3, 5)
+	K = slice(5, 11)
+
+	def __init__(self, flo, model, t0, tf, dt=0.01, Q=None, R=None, Qf=None):
+		"""
+		Args:
+			flo		: planners (flo_f, flo_g) or their FlatTrajectory
+			model	: car model, provides the linearization and parameters
+			t0, tf	: time interval of the gain schedule
+			dt		: spacing of the table
+			Q		: weight of the state error (size = (3, 3))
+			R		: weight of the input error (size = (2, 2))
+			Qf		: weight of the final state error (size = (3, 3))
+		"""
+		super().__init__(model.params)
+		if isinstance(flo, FlatTrajectory):
+			self.ref = flo
+		else:
+			self.ref = FlatTrajectory(flo, model.params)
+		self.flo = (self.ref.flo_f, self.ref.flo_g)
+
+		self.Q = np.eye(3) if Q is None else np.asarray(Q, dtype=float)
+		self.R = np.eye(2) if R is None else np.asarray(R, dtype=float)
+		self.Qf = self.Q if Qf is None else np.asarray(Qf, dtype=float)
+
+		self.tabulate(model, t0, tf, dt)
+
+	def tabulate(self, model, t0, tf, dt):
+		"""Solves the Riccati equation and stores the gain schedule.
+
+		Args:
+			model	: car model
+			t0, tf	: time interval of the gain schedule
+			dt		: spacing of the table
+		"""
+		n = int(np.ceil((tf - t0) / dt - 1e-9)) + 1
+		tt = np.linspace(t0, tf, n)
+		self.t0 = t0
+		self.tf = tf
+		self.dt = (tf - t0) / (n - 1)
+
+		ref = self.ref.eval(tt)
+		x_ref = ref[:, [FlatTrajectory.Y1, FlatTrajectory.Y2, FlatTrajectory.THETA]]
+		u_ref = self.ref.inputs(ref)
+
+		R_inv = np.linalg.inv(self.R)
+		def riccati(t, p):
+			r = self.ref.eval(t)
+			A, B = model.linearize(t, r[[FlatTrajectory.Y1, FlatTrajectory.Y2, FlatTrajectory.THETA]],
+				self.ref.inputs(r))
+			P = p.reshape([3, 3])
+			dP = -(A.T @ P + P @ A - P @ B @ R_inv @ B.T @ P + self.Q)
+			return dP.ravel()
+
+		# backwards in time from the final weight
+		sol = sci.solve_ivp(riccati, (tf, t0), self.Qf.ravel(), t_eval=tt[::-1], rtol=1e-6, atol=1e-9)
+		if sol.status == -1:
+			raise RuntimeError(sol.message)
+		P = sol.y.T[::-1].reshape([n, 3, 3])
+
+		B = np.array([model.linearize(tt[i], x_ref[i], u_ref[i])[1] for i in range(0, n)])
+		K = R_inv @ np.transpose(B, (0, 2, 1)) @ P
+
+		self.table = np.concatenate([x_ref, u_ref, K.reshape([n, 6])], axis=1)
+		self.slope = np.diff(self.table, axis=0)
+
+	def lookup(self, t):
+		"""Interpolated table rows, constant beyond the ends of the table"""
+		return interpolate(self.table, self.slope, self.t0, self.tf, self.dt, t)
+
+	# Overridden
+	def control(self, t, x):
+		"""Function of the control law.
+
+		Args:
+			x (ndarray): state vector, block of states (size = (3, N)) or
+				sampled states (size = (T, 3))
+			t (int, ndarray): time or time vector (size = T)
+
+		Returns:
+			u		: control vector, one row per time or member
+		"""
+		super().control(t, x)
+
+		row = self.lookup(t)
+		K = row[..., self.K].reshape(np.shape(t) + (2, 3))
+
+		# state error, one column per time or member
+		x = np.asarray(self.states(t, x), dtype=float)
+		x_ref = row[..., self.X_REF].T
+		if x.ndim > x_ref.ndim:
+			x_ref = x_ref[:, np.newaxis]
+		e = x - x_ref
+		e[2] = (e[2] + np.pi) % (2 * np.pi) - np.pi
+
+		if np.ndim(t) > 0:
+			du = np.einsum('tij,jt->ti', K, e)
+		else:
+			du = np.dot(K, e).T
+		return row[..., self.U_REF] - du
+
+	# Overridden
+	def control_jac(self, t, x):
+		"""Derivative of the control law with respect to the state.
+
+		Args:
+			x (ndarray, int): state vector
+			t (int): time
+
+		Returns:
+			dudx	: Jacobian of the control vector (size = (2, 3))
+		"""
+		return -self.lookup(t)[self.K].reshape([2, 3])
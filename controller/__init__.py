@@ -1,3 +1,6 @@
 from .ConstantController import ConstantController
 from .FeedForwardController import FeedForwardController
 from .FeedbackController import FeedbackController
+from .FlatTrajectory import FlatTrajectory
+from .GainTuner import GainTuner
+from .LQRController import LQRController
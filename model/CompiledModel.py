@@ -0,0 +1,130 @@
+#! /usr/bin/python3
+
+# CompiledModel.py
+
+import numpy as np
+
+from .Model import Model
+from .Parameters import Parameters
+
+class CompiledModel(Model):
+	"""Model with NumPy code generated from symbolic dynamics.
+
+		Subclasses are created by compiler.compile_model. The generated
+		functions accept a single state (size = n) or a block of states
+		(size = (n, N)) and read the parameters from self.params, which may
+		also hold per-member arrays (size = N).
+
+	Class attributes:
+		states (tuple)		: names of the states
+		input_names (tuple)	: names of the inputs
+		defaults (dict)		: default parameter values
+		source (str)		: generated code of f, f_x and f_u
+		jac_sparsity		: structure of the closed loop Jacobian, see
+							  compiler.jacobian_sparsity
+	"""
+	states = ()
+	input_names = ()
+	defaults = {}
+	source = ''
+
+	def __init__(self, params=None, controller=None):
+		super().__init__(Parameters(), controller)
+		self.params.append(self.defaults)
+		if params is not None:
+			self.params.append(params)
+
+	# Overridden
+	def ode(self, t, x):
+		"""Dynamics of the modelled system with the inputs of the controller.
+
+		Args:
+			t		: time
+			x 		: state, or block of states (size = (n, N))
+
+		Returns:
+			dxdt	: state derivative
+		"""
+		u = np.transpose(self.controller.control(t, x))
+		return self.dynamics(t, x, u)
+
+	# Overridden
+	def dynamics(self, t, x, u):
+		"""Dynamics for a given input.
+
+		Args:
+			t		: time
+			x 		: state, or block of states (size = (n, N))
+			u		: input, or block of inputs (size = (m, N))
+
+		Returns:
+			dxdt	: state derivative
+		"""
+		return self.f(t, x, u, self.params)
+
+	# Overridden
+	def jac(self, t, x):
+		"""Jacobian of the closed loop dynamics, A + B * du/dx.
+
+		Args:
+			t		: time
+			x 		: state
+
+		Returns:
+			dfdx	: Jacobian (size = (n, n))
+		"""
+		u = self.controller.control(t, x)
+		A, B = self.linearize(t, x, u)
+		return A + np.dot(B, self.controller.control_jac(t, x))
+
+	def linearize(self, t, x, u):
+		"""Linearization of the dynamics around a state and input.
+
+		Args:
+			t		: time
+			x 		: state, or block of states (size = (n, N))
+			u		: input, or block of inputs (size = (m, N))
+
+		Returns:
+			A		: derivative w.r.t. the state (size = (n, n) or (n, n, N))
+			B		: derivative w.r.t. the input (size = (n, m) or (n, m, N))
+		"""
+		return self.f_x(t, x, u, self.params), self.f_u(t, x, u, self.params)
+
+	def __reduce__(self):
+		# the generated class only exists at runtime, so it is rebuilt from its source
+		cls = type(self)
+		return (rebuild, (cls.__name__, cls.states, cls.input_names, cls.defaults, cls.source,
+			cls.jac_sparsity), self.__dict__)
+
+def make_class(name, states, input_names, defaults, source, jac_sparsity=None):
+	"""Creates a CompiledModel subclass from generated code.
+
+	Args:
+		name (str)			: class name
+		states (tuple)		: names of the states
+		input_names (tuple)	: names of the inputs
+		defaults (dict)		: default parameter values
+		source (str)		: code defining f, f_x and f_u
+		jac_sparsity		: optional structure of the Jacobian (size = (n, n))
+
+	Returns:
+		subclass of CompiledModel
+	"""
+	namespace = {'np': np, 'numpy': np}
+	exec(compile(source, '<{}>'.format(name), 'exec'), namespace)
+	return type(name, (CompiledModel,), {
+		'states': tuple(states),
+		'input_names': tuple(input_names),
+		'defaults': dict(defaults),
+		'source': source,
+		'jac_sparsity': jac_sparsity,
+		'f': staticmethod(namespace['f']),
+		'f_x': staticmethod(namespace['f_x']),
+		'f_u': staticmethod(namespace['f_u'])
+		})
+
+def rebuild(name, states, input_names, defaults, source, jac_sparsity=None):
+	"""Creates an uninitialized instance of a compiled model, used by pickle"""
+	cls = make_class(name, states, input_names, defaults, source, jac_sparsity)
+	return cls.__new__(cls)
@@ -3,10 +3,19 @@
 # Model.py
 
 from abc import ABC, abstractmethod
+import numpy as np
+
 from .Parameters import Parameters
 
 class Model(ABC):
-	"""Dynamical system being modelled."""
+	"""Dynamical system being modelled.
+	
+		Models may set jac_sparsity to the structure of their Jacobian
+		(size = (n, n), nonzero where entries may be nonzero). Callers pass
+		it to Simulation.simulate, which forwards it to implicit solvers that
+		approximate the Jacobian by finite differences.
+	"""
+	jac_sparsity = None
 	
 	def __init__(self, params=Parameters(), controller=None):
 		self.params = params
@@ -24,4 +33,47 @@ class Model(ABC):
 		Returns:
 			dxdt	: state derivative
 		"""
-		pass
\ No newline at end of file
+		pass
+		
+	def inputs(self, t, x):
+		"""Control inputs along a sampled trajectory, evaluated in one call
+			if the controller is vectorized and sample by sample otherwise.
+		
+		Args:
+			t		: sample times (size = T)
+			x 		: sampled states (size = (T, n))
+			
+		Returns:
+			u		: control inputs (size = (T, m))
+		"""
+		controller = self.controller
+		if controller.vectorized:
+			return np.asarray(controller.control(t, x))
+		return np.array([controller.control(t[i], x[i]) for i in range(0, len(t))])
+		
+	def jac(self, t, x):
+		"""Jacobian of the ode function with respect to the state,
+			including the state dependence of the controller.
+		
+		Args:
+			t		: time
+			x 		: state
+			
+		Returns:
+			dfdx	: Jacobian (size = (n, n))
+		"""
+		raise NotImplementedError('{} does not provide a Jacobian.'.format(type(self).__name__))
+		
+	def dynamics(self, t, x, u):
+		"""Dynamics of the modelled system for a given input, used
+			when the inputs are not computed by the controller.
+		
+		Args:
+			t		: time
+			x 		: state
+			u		: input
+			
+		Returns:
+			dxdt	: state derivative
+		"""
+		raise NotImplementedError('{} does not provide dynamics for external inputs.'.format(type(self).__name__))
\ No newline at end of file
@@ -1,2 +1,4 @@
 from .Model import Model
-from .Parameters import Parameters
\ No newline at end of file
+from .Parameters import Parameters
+from .CompiledModel import CompiledModel
+from .compiler import compile_model, state_space
\ No newline at end of file
@@ -0,0 +1,177 @@
+#! /usr/bin/python3
+
+# compiler.py
+
+import keyword
+
+import numpy as np
+
+from cache import cached
+
+from .CompiledModel import make_class
+
+# module names of the generated code, besides the underscored arguments and temporaries
+RESERVED = ('np', 'numpy')
+
+def state_space(eqs, q, t):
+	"""First order system of equations of motion of second order.
+
+		The equations have to be linear in the second derivatives of the
+		coordinates, as e.g. the Lagrange equations of mechanical systems.
+		If the cache is enabled, the result is loaded from it.
+
+	Args:
+		eqs (list)	: expressions that vanish along the motion
+		q (list)	: coordinates, functions of t
+		t (Symbol)	: time
+
+	Returns:
+		x (list)	: state symbols, the coordinates followed by their derivatives
+		f (Matrix)	: state derivative
+	"""
+	return cached('state_space', (eqs, q, t), lambda : derive_state_space(eqs, q, t))
+
+def derive_state_space(eqs, q, t):
+	import sympy as sp
+
+	names = [qi.func.__name__ for qi in q]
+	pos = sp.symbols(names)
+	vel = sp.symbols(['d' + name for name in names])
+	acc = sp.symbols(['dd' + name for name in names])
+
+	# derivatives are replaced first, as they contain the coordinates
+	subs = [(qi.diff(t, 2), ai) for qi, ai in zip(q, acc)]
+	subs += [(qi.diff(t), vi) for qi, vi in zip(q, vel)]
+	subs += [(qi, pi) for qi, pi in zip(q, pos)]
+	eqs = [sp.sympify(eq).subs(subs) for eq in eqs]
+
+	M, rhs = sp.linear_eq_to_matrix(eqs, acc)
+	ddq = M.LUsolve(rhs)
+
+	return list(pos) + list(vel), sp.Matrix(list(vel) + list(ddq))
+
+def compile_model(f, x, u, params=None, t=None, name='CompiledModel'):
+	"""Generates a model from symbolic dynamics dx/dt = f(t, x, u).
+
+		The dynamics and their derivatives w.r.t. the states and inputs are
+		reduced by common subexpression elimination and printed as NumPy
+		code, so the model evaluates them at the speed of hand written code.
+		All other symbols of f are parameters, read from the params of the
+		model at runtime. The structure of the Jacobian is stored as
+		jac_sparsity of the class. If the cache is enabled, the generated
+		code is loaded from it.
+
+	Args:
+		f (Matrix)		: state derivative
+		x (list)		: state symbols
+		u (list)		: input symbols
+		params			: default parameter values, dict or pairs of symbol
+						  and value
+		t (Symbol)		: optional time symbol
+		name (str)		: name of the generated class
+
+	Returns:
+		subclass of model.CompiledModel
+	"""
+	import sympy as sp
+
+	f = sp.Matrix(f)
+	x = list(x)
+	u = list(u)
+	defaults = {str(symbol): float(value) for symbol, value in dict(params or {}).items()}
+
+	source = cached('generate_source', (f, x, u, t), lambda : generate_source(f, x, u, t))
+	sparsity = cached('jacobian_sparsity', (f, x, u), lambda : jacobian_sparsity(f, x, u))
+
+	return make_class(name, [str(xi) for xi in x], [str(ui) for ui in u], defaults, source, sparsity)
+
+def jacobian_sparsity(f, x, u):
+	"""Structure of the closed loop Jacobian f_x + f_u * du/dx.
+
+		An entry may be nonzero if f depends on the state directly, or if
+		the row depends on an input, which a feedback law may compute from
+		any state.
+
+	Returns:
+		sparsity (ndarray): True where entries may be nonzero (size = (n, n))
+	"""
+	f_x = f.jacobian(x)
+	sparsity = np.array([[f_x[i, j] != 0 for j in range(0, len(x))] for i in range(0, len(f))])
+	if u:
+		f_u = f.jacobian(u)
+		sparsity |= np.array([[any(f_u[i, k] != 0 for k in range(0, len(u)))] for i in range(0, len(f))])
+	return sparsity
+
+def generate_source(f, x, u, t):
+	"""NumPy code of the dynamics f and their Jacobians f_x and f_u"""
+	arguments = set(x) | set(u) | ({t} if t is not None else set())
+	parameters = sorted((symbol for symbol in f.free_symbols if symbol not in arguments), key=str)
+	names = local_names(list(x) + list(u) + parameters + ([t] if t is not None else []))
+
+	return '\n'.join([
+		generate('f', f, x, u, parameters, t, names, vector=True),
+		generate('f_x', f.jacobian(x), x, u, parameters, t, names),
+		generate('f_u', f.jacobian(u), x, u, parameters, t, names)
+		])
+
+def local_names(symbols):
+	"""Names of the local variables of the symbols in the generated code.
+
+		Symbol names that are no identifiers, Python keywords, reserved module
+		names or start with an underscore, like the arguments _t, _x, _u, _p
+		and the temporaries of the generated functions, are replaced by _s0,
+		_s1, ...
+	"""
+	names = {}
+	for k, symbol in enumerate(symbols):
+		name = str(symbol)
+		if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_') or name in RESERVED:
+			name = '_s{}'.format(k)
+		names[symbol] = name
+	return names
+
+def generate(fname, expr, x, u, parameters, t, names, vector=False):
+	"""NumPy code of a function fname(_t, _x, _u, _p) evaluating a matrix expression.
+
+		The result has size n for a vector and (n, m) for a matrix, blocks
+		of states add the trailing dimension N. The symbols are bound to the
+		local variables names, see local_names.
+	"""
+	import sympy as sp
+	try:
+		from sympy.printing.numpy import NumPyPrinter
+	except ImportError:
+		from sympy.printing.pycode import NumPyPrinter
+
+	printer = NumPyPrinter({'fully_qualified_modules': True})
+
+	renamed = {symbol: sp.Symbol(name) for symbol, name in names.items() if str(symbol) != name}
+	replacements, reduced = sp.cse(list(expr.xreplace(renamed)), symbols=sp.numbered_symbols('_c'))
+
+	lines = ['def {}(_t, _x, _u, _p):'.format(fname)]
+	lines.append('\t{}, = _x'.format(', '.join(names[xi] for xi in x)))
+	if u:
+		lines.append('\t{}, = _u'.format(', '.join(names[ui] for ui in u)))
+	if t is not None:
+		lines.append('\t{} = _t'.format(names[t]))
+	for symbol in parameters:
+		if str(symbol).isidentifier():
+			lines.append('\t{} = _p.{}'.format(names[symbol], symbol))
+		else:
+			lines.append('\t{} = getattr(_p, {!r})'.format(names[symbol], str(symbol)))
+	for symbol, value in replacements:
+		lines.append('\t{} = {}'.format(symbol, printer.doprint(value)))
+
+	size = '({},)'.format(expr.shape[0]) if vector else '({}, {})'.format(*expr.shape)
+	lines.append('\t_out = np.zeros({} + np.broadcast({}).shape)'.format(size,
+		', '.join(names[symbol] for symbol in [x[0]] + u[0:1] + parameters)))
+	for k, value in enumerate(reduced):
+		if value == 0:
+			continue
+		i, j = divmod(k, expr.shape[1])
+		index = str(i) if vector else '{}, {}'.format(i, j)
+		lines.append('\t_out[{}] = {}'.format(index, printer.doprint(value)))
+	lines.append('\treturn _out')
+	lines.append('')
+
+	return '\n'.join(lines)
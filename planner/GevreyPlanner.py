@@ -1,8 +1,6 @@
 from .BasePlanner import Planner
 
 import numpy as np
-import math
-import scipy as sp
 from scipy import special
 
 class GevreyPlanner(Planner):
@@ -37,19 +35,7 @@ class GevreyPlanner(Planner):
         Returns:
             Y (ndarray): y and its derivatives at t
         """
-        Y = np.zeros([(self.d + 1)])
-        if t < self.t0:
-            Y[0] = self.YA[0]
-        elif t > self.tf:
-            Y[0] = self.YB[0]
-        else:
-            T = min(max((t-self.t0)/(self.tf-self.t0),0.001),0.999)
-            phi = self.phi(T)
-            Y = np.zeros_like(phi)
-            Y[0] = self.YA[0] + (self.YB[0] - self.YA[0]) * phi[0]
-            for i in range(1, self.d + 1):
-                Y[i] = (1 / (self.tf - self.t0)) ** i * (self.YB[0] - self.YA[0]) * phi[i]
-        return Y
+        return self.eval_vec(np.array([t]))[0]
 
 
     def eval_vec(self, tt):
@@ -62,54 +48,71 @@ class GevreyPlanner(Planner):
             Y (ndarray): y and its derivatives at the sample points
 
         """
-        Y = np.zeros([len(tt), len(self.YA)])
-        for i in range(0, len(tt)):
-            Y[i] = self.eval(tt[i])
+        tt = np.asarray(tt, dtype=float)
+        T = np.clip((tt - self.t0)/(self.tf - self.t0), 0.001, 0.999)
+        phi = self.phi(T)
+
+        # scale the derivatives of phi to the interval [t0, tf]
+        scale = (1 / (self.tf - self.t0)) ** np.arange(0, self.d + 1) * (self.YB[0] - self.YA[0])
+        Y = phi * scale
+        Y[:, 0] += self.YA[0]
+
+        Y[tt < self.t0] = 0
+        Y[tt < self.t0, 0] = self.YA[0]
+        Y[tt > self.tf] = 0
+        Y[tt > self.tf, 0] = self.YB[0]
         return Y
 
     def phi(self, t):
-        """Calculates phi = 1/2*(1 + tanh( 2(2t-1) / (4t(1-t))^s )) ) and it's derivatives up to order d"""
-        phi = np.zeros([self.d + 1])
-        phi[0] = 1/2*(1 + self.y(t, 0))
-        for i in range(1, self.d + 1):
-            phi[i] = 1/2*self.y(t, i)
-        return phi
+        """Calculates phi = 1/2*(1 + tanh( 2(2t-1) / (4t(1-t))^s )) ) and it's derivatives up to order d
 
+        Args:
+            t (float, ndarray): normalized time in (0, 1)
+
+        Returns:
+            phi (ndarray): phi and its derivatives, shape (d+1,) for scalar t, (len(t), d+1) otherwise
+        """
+        phi = 1/2*self.derivatives(t)
+        phi[0] += 1/2
+        return np.moveaxis(phi, 0, -1)
 
-    def y(self, t, n):
-        """Calculates y = tanh( 2(2t-1) / (4t(1-t))^s )) and it's derivatives up to order n"""
-        s = self.s
-        if n == 0:
-            # eq. A.3
-            y = np.tanh(2*(2*t - 1) / ((4*t*(1 - t))**s))
-        elif n == 1:
-            # eq. A.5
-            y = self.a(t, 2)*(1 - self.y(t, 0)**2)
-        else:
-            # eq. A.7
-            y = sum(sp.special.binom(n - 1, k)*self.a(t, k + 2)*self.z(t, n - 1 - k) for k in range(0, n))
-        return y
 
+    def derivatives(self, t):
+        """Calculates y = tanh( 2(2t-1) / (4t(1-t))^s )) and it's derivatives up to order d.
 
-    def a(self, t, n):
+        The derivative tables of a, y and z are filled once, bottom-up, so that every
+        lower order term is computed exactly once per time sample.
+
+        Args:
+            t (float, ndarray): normalized time in (0, 1)
+
+        Returns:
+            y (ndarray): y and its derivatives, shape (d+1,) + shape of t
+        """
         s = self.s
-        if n == 0:
-            # eq. A.4
-            a = ((4*t*(1 - t))**(1 - s))/(2*(s - 1))
-        elif n == 1:
-            # eq. for da/dt
-            a = 2*(2*t - 1) / ((4*t*(1 - t))**s)
-        else:
-            # eq. for the n-th derivative of a
-            a = 1/(t*(1 - t))*((s - 2+n)*(2*t - 1)*self.a(t, n - 1) + (n - 1)*(2*s - 4 + n)*self.a(t, n - 2))
-        return a
-
-
-    def z(self, t, n):
-        if n == 0:
-            # eq. A.6
-            z = (1-self.y(t, 0)**2)
-        else:
+        d = self.d
+        t = np.asarray(t, dtype=float)
+
+        # a and its derivatives up to order d+1
+        a = np.zeros((d + 2,) + t.shape)
+        # eq. A.4
+        a[0] = ((4*t*(1 - t))**(1 - s))/(2*(s - 1))
+        # eq. for da/dt
+        a[1] = 2*(2*t - 1) / ((4*t*(1 - t))**s)
+        # eq. for the n-th derivative of a
+        for n in range(2, d + 2):
+            a[n] = 1/(t*(1 - t))*((s - 2 + n)*(2*t - 1)*a[n - 1] + (n - 1)*(2*s - 4 + n)*a[n - 2])
+
+        y = np.zeros((d + 1,) + t.shape)
+        z = np.zeros((d + 1,) + t.shape)
+
+        # eq. A.3 and A.6
+        y[0] = np.tanh(a[1])
+        z[0] = 1 - y[0]**2
+        for n in range(1, d + 1):
+            # eq. A.5 and A.7
+            y[n] = sum(special.binom(n - 1, k)*a[k + 2]*z[n - 1 - k] for k in range(0, n))
             # eq. for n-th derivative of z
-            z = - sum(sp.special.binom(n, k)*self.y(t, k)*self.y(t, n - k) for k in range(0, n + 1))
-        return z
+            if n < d:
+                z[n] = - sum(special.binom(n, k)*y[k]*y[n - k] for k in range(0, n + 1))
+        return y
@@ -0,0 +1,151 @@
+from .BasePlanner import Planner
+from .PolynomialPlanner import t_matrix
+from .horner import horner_each, derivative_coefficients
+
+import numpy as np
+from scipy import linalg
+
+from cache import cached
+
+class PiecewisePolynomialPlanner(Planner):
+    """Planner subclass that passes through a list of waypoints with piecewise polynomials
+
+    Every segment between two knots is a polynomial of degree 2d+1 in the local time
+    tau = t - tk. The segments match the waypoints, YA and YB, and their derivatives up to
+    order 2d are continuous at the interior knots (so the trajectory is at least C^d).
+    All segments are found from one banded linear equation system, so the cost grows
+    linearly with the number of waypoints. If the cache is enabled, the solution is loaded
+    from it.
+
+    Attributes:
+        tk (ndarray): interior knot times, strictly increasing in (t0, tf)
+        yk (ndarray): waypoints at the interior knots
+        knots (ndarray): all knot times [t0, tk, tf]
+        c (ndarray): parameter vectors of the segments (size = (K, 2d+2))
+        C (ndarray): coefficients of y and its derivatives in powers of tau (size = (K, d+1, 2d+2))
+
+    """
+
+    def __init__(self, YA, YB, t0, tf, d, tk, yk):
+        super().__init__(YA, YB, t0, tf, d)
+        self.tk = np.asarray(tk, dtype=float)
+        self.yk = np.asarray(yk, dtype=float)
+        if self.tk.shape != self.yk.shape:
+            raise ValueError('Every interior knot needs exactly one waypoint.')
+
+        self.knots = np.concatenate([[t0], self.tk, [tf]])
+        if any(np.diff(self.knots) <= 0):
+            raise ValueError('Knot times have to be strictly increasing from t0 to tf.')
+
+        self.c = cached('PiecewisePolynomialPlanner.coefficients',
+                        (self.YA, self.YB, self.t0, self.tf, self.d, self.tk, self.yk), self.coefficients)
+        self.C = self.derivative_coefficients()
+
+    def eval(self, t):
+        """Evaluates the planned trajectory at time t.
+
+        Args:
+            t (int, float): time
+
+        Returns:
+            Y (ndarray): y and its derivatives at t
+        """
+        return self.eval_vec(np.array([t]))[0]
+
+    def eval_vec(self, tt):
+        """Samples the planned trajectory
+
+        Args:
+            tt (ndarray): time vector
+
+        Returns:
+            Y (ndarray): y and its derivatives at the sample points
+
+        """
+        tt = np.asarray(tt, dtype=float)
+
+        # binary search for the segment of every sample
+        k = np.clip(np.searchsorted(self.knots, tt, side='right') - 1, 0, len(self.c) - 1)
+        Y = horner_each(self.C[k], tt - self.knots[k])
+
+        Y[tt < self.t0] = self.YA
+        Y[tt > self.tf] = self.YB
+        return Y
+
+    def coefficients(self):
+        """Calculation of the segment parameter vectors from one banded equation system
+
+        The unknowns are ordered segment by segment and the conditions knot by knot, so each
+        row only couples two neighbouring segments.
+
+        Returns:
+            c (ndarray): parameter vectors of the segments (size = (K, 2d+2))
+
+        """
+        d = self.d
+        m = 2*d + 2
+        K = len(self.knots) - 1
+
+        # derivatives 0..2d of every segment at its end
+        Th = t_matrix(np.diff(self.knots), d, 2*d + 1)
+
+        rows, cols, vals = [], [], []
+        def add(i, j, v):
+            rows.append(i)
+            cols.append(j)
+            vals.append(v)
+
+        b = np.zeros([K * m])
+
+        # start values at t0
+        for j in range(0, d + 1):
+            add(j, j, 1.0)
+            b[j] = self.YA[j]
+
+        # interior knots
+        for k in range(1, K):
+            r = d + 1 + (k - 1) * m
+            left = (k - 1) * m
+            right = k * m
+
+            # waypoint at the end of the left segment
+            for i in range(0, m):
+                add(r, left + i, Th[k - 1, 0, i])
+            b[r] = self.yk[k - 1]
+
+            # continuity of the derivatives 1..2d
+            for j in range(1, 2*d + 1):
+                for i in range(j, m):
+                    add(r + j, left + i, Th[k - 1, j, i])
+                add(r + j, right + j, -1.0)
+
+            # waypoint at the start of the right segment
+            add(r + 2*d + 1, right, 1.0)
+            b[r + 2*d + 1] = self.yk[k - 1]
+
+        # final values at tf
+        r = d + 1 + (K - 1) * m
+        for j in range(0, d + 1):
+            for i in range(j, m):
+                add(r + j, (K - 1) * m + i, Th[K - 1, j, i])
+            b[r + j] = self.YB[j]
+
+        # banded storage ab[u + i - j, j] = A[i, j]
+        rows = np.array(rows)
+        cols = np.array(cols)
+        l = max(np.max(rows - cols), 0)
+        u = max(np.max(cols - rows), 0)
+        ab = np.zeros([l + u + 1, K * m])
+        ab[u + rows - cols, cols] = vals
+
+        c = linalg.solve_banded((l, u), ab, b)
+        return c.reshape([K, m])
+
+    def derivative_coefficients(self):
+        """Rearranges the parameter vectors into the coefficients of y and its derivatives
+
+        Returns:
+            C (ndarray): coefficient matrices of the segments (size = (K, d+1, 2d+2))
+
+        """
+        return derivative_coefficients(self.c, self.d + 1)
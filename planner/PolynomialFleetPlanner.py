@@ -0,0 +1,107 @@
+from .BasePlanner import Planner
+from .PolynomialPlanner import t_matrix, boundary_inverse
+from .horner import horner, derivative_coefficients
+
+import numpy as np
+
+from cache import cached
+
+class PolynomialFleetPlanner(Planner):
+    """Planner subclass that plans N polynomial trajectories at once
+
+    All coefficient systems are solved in one batched linear algebra call. If t0 and tf are
+    shared by all trajectories, the cached inverse boundary matrix of PolynomialPlanner is used.
+    If the cache is enabled, the coefficients are loaded from it.
+
+    Attributes:
+        YA (ndarray): start values (size = (N, d+1))
+        YB (ndarray): final values (size = (N, d+1))
+        t0 (int, float, ndarray): start time, scalar or one per trajectory (size = N)
+        tf (int, float, ndarray): final time, scalar or one per trajectory (size = N)
+        N (int): number of trajectories
+        c (ndarray): parameter vectors of the polynomials (size = (N, 2d+2))
+        C (ndarray): coefficients of y and its derivatives in powers of t (size = (N, d+1, 2d+2))
+
+    """
+
+    def __init__(self, YA, YB, t0, tf, d):
+        super().__init__(np.atleast_2d(YA), np.atleast_2d(YB), t0, tf, d)
+        self.N = self.YA.shape[0]
+        self.c = cached('PolynomialFleetPlanner.coefficients',
+                        (self.YA, self.YB, self.t0, self.tf, self.d), self.coefficients)
+        self.C = self.derivative_coefficients()
+
+    def eval(self, t):
+        """Evaluates all planned trajectories at time t.
+
+        Args:
+            t (int, float): time
+
+        Returns:
+            Y (ndarray): y and its derivatives at t (size = (N, d+1))
+        """
+        return self.eval_vec(np.array([t]))[:, 0]
+
+    def eval_vec(self, tt):
+        """Samples all planned trajectories on a shared time vector
+
+        Args:
+            tt (ndarray): time vector
+
+        Returns:
+            Y (ndarray): y and its derivatives at the sample points (size = (N, len(tt), d+1))
+
+        """
+        tt = np.asarray(tt, dtype=float)
+        Y = horner(self.C, tt)
+
+        t0 = np.broadcast_to(self.t0, (self.N,))[:, np.newaxis]
+        tf = np.broadcast_to(self.tf, (self.N,))[:, np.newaxis]
+        Y = np.where((tt < t0)[..., np.newaxis], self.YA[:, np.newaxis, :], Y)
+        Y = np.where((tt > tf)[..., np.newaxis], self.YB[:, np.newaxis, :], Y)
+        return Y
+
+    def coefficients(self):
+        """Calculation of the polynomial parameter vectors
+
+        Returns:
+            c (ndarray): parameter vectors of the polynomials (size = (N, 2d+2))
+
+        """
+        Y = np.append(self.YA, self.YB, axis=1)
+
+        if np.ndim(self.t0) == 0 and np.ndim(self.tf) == 0:
+            # shared boundary matrix
+            return np.dot(Y, boundary_inverse(float(self.t0), float(self.tf), int(self.d)).T)
+
+        t0 = np.broadcast_to(self.t0, (self.N,))
+        tf = np.broadcast_to(self.tf, (self.N,))
+        T = np.append(t_matrix(t0, self.d), t_matrix(tf, self.d), axis=1)
+
+        # solve all linear equation systems for c at once
+        c = np.linalg.solve(T, Y[..., np.newaxis])[..., 0]
+        return c
+
+    def derivative_coefficients(self):
+        """Rearranges the parameter vectors into the coefficients of y and its derivatives
+
+        Returns:
+            C (ndarray): coefficient matrices (size = (N, d+1, 2d+2))
+
+        """
+        return derivative_coefficients(self.c, self.d + 1)
+
+    def set_boundary_values(self, YA, YB):
+        """Replans all trajectories in place for new boundary values, keeping t0, tf and d
+
+        Args:
+            YA (ndarray): start values (size = (N, d+1))
+            YB (ndarray): final values (size = (N, d+1))
+
+        """
+        self.YA = np.atleast_2d(YA)
+        self.YB = np.atleast_2d(YB)
+        self.N = self.YA.shape[0]
+        self.c = cached('PolynomialFleetPlanner.coefficients',
+                        (self.YA, self.YB, self.t0, self.tf, self.d), self.coefficients)
+        self.C = self.derivative_coefficients()
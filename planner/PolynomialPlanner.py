@@ -1,19 +1,73 @@
 from .BasePlanner import Planner
+from .horner import horner, derivative_coefficients
 
 import numpy as np
 import math
+from functools import lru_cache
+
+# number of boundary matrices kept by boundary_inverse before the least recently used is evicted
+BOUNDARY_CACHE_SIZE = 256
+
+def t_matrix(t, d, n=None):
+    """Computes the T matrix of a polynomial of smoothness d at time t
+
+    Args:
+        t (int, float, ndarray): time or vector of N times
+        d (int): trajectory is smooth up at least to the d-th derivative
+        n (int): number of derivatives (rows) to compute, defaults to d+1
+
+    Returns:
+        T (ndarray): T matrix (size = (n, 2d+2)), stacked to (N, n, 2d+2) for a time vector
+
+    """
+    if n is None:
+        n = d+1 # first dimension of T
+    m = 2*d+2 # second dimension of T
+
+    # T[j, i] = t^(i-j) / (i-j)! for i >= j
+    E = np.arange(0, m)[np.newaxis, :] - np.arange(0, n)[:, np.newaxis]
+    upper = E >= 0
+    E = np.where(upper, E, 0)
+    fact = np.array([math.factorial(i) for i in range(0, m)], dtype=float)
+
+    t = np.asarray(t, dtype=float)[..., np.newaxis, np.newaxis]
+    T = np.where(upper, t ** E / fact[E], 0)
+    return T
+
+@lru_cache(maxsize=BOUNDARY_CACHE_SIZE)
+def boundary_inverse(t0, tf, d):
+    """Inverse of the boundary matrix [T(t0); T(tf)], shared by all planners with equal t0, tf and d
+
+    The result is cached process-wide (see boundary_inverse.cache_info() and
+    boundary_inverse.cache_clear()) and must not be modified.
+
+    Args:
+        t0 (int, float): start time
+        tf (int, float): final time
+        d (int): trajectory is smooth up at least to the d-th derivative
+
+    Returns:
+        T_inv (ndarray): inverse boundary matrix (size = (2d+2, 2d+2))
+
+    """
+    T = np.append(t_matrix(t0, d), t_matrix(tf, d), axis=0)
+    T_inv = np.linalg.inv(T)
+    T_inv.flags.writeable = False
+    return T_inv
 
 class PolynomialPlanner(Planner):
     """Planner subclass that uses a polynomial approach for trajectory generation
 
     Attributes:
         c (ndarray): parameter vector of polynomial
+        C (ndarray): coefficients of y and its derivatives in powers of t (size = (d+1, 2d+2))
 
     """
 
     def __init__(self, YA, YB, t0, tf, d):
         super().__init__(YA, YB, t0, tf, d)
         self.c = self.coefficients()
+        self.C = self.derivative_coefficients()
 
     def eval(self, t):
         """Evaluates the planned trajectory at time t.
@@ -29,7 +83,7 @@ class PolynomialPlanner(Planner):
         elif t > self.tf:
             Y = self.YB
         else:
-            Y = np.dot(self.TMatrix(t), self.c)
+            Y = horner(self.C, t)
         return Y
 
     def eval_vec(self, tt):
@@ -42,9 +96,10 @@ class PolynomialPlanner(Planner):
             Y (ndarray): y and its derivatives at the sample points
 
         """
-        Y = np.zeros([len(tt), len(self.YA)])
-        for i in range(0, len(tt)):
-            Y[i] = self.eval(tt[i])
+        tt = np.asarray(tt, dtype=float)
+        Y = horner(self.C, tt)
+        Y[tt < self.t0] = self.YA
+        Y[tt > self.tf] = self.YB
         return Y
 		
     def TMatrix(self, t):
@@ -57,18 +112,7 @@ class PolynomialPlanner(Planner):
             T (ndarray): T matrix
 
         """
-
-        d = self.d
-        n = d+1 # first dimension of T
-        m = 2*d+2 # second dimension of T
-
-        T = np.zeros([n, m])
-
-        for i in range(0, m):
-            T[0, i] = t ** i / math.factorial(i)
-        for j in range(1, n):
-            T[j, j:m] = T[0, 0:m-j]
-        return T
+        return t_matrix(t, self.d)
 		
     def coefficients(self):
         """Calculation of the polynomial parameter vector
@@ -77,16 +121,33 @@ class PolynomialPlanner(Planner):
             c (ndarray): parameter vector of the polynomial
 
         """
-        t0 = self.t0
-        tf = self.tf
-
         Y = np.append(self.YA, self.YB)
 
-        T0 = self.TMatrix(t0)
-        Tf = self.TMatrix(tf)
+        # solve the linear equation system for c with the cached inverse
+        c = np.dot(boundary_inverse(float(self.t0), float(self.tf), int(self.d)), Y)
+        return c
 
-        T = np.append(T0, Tf, axis=0)
+    def set_boundary_values(self, YA, YB):
+        """Replans the trajectory in place for new boundary values, keeping t0, tf and d
 
-        # solve the linear equation system for c
-        c = np.linalg.solve(T, Y)
-        return c
+        Args:
+            YA (int, float, ndarray): start value (size = d+1)
+            YB (int, float, ndarray): final value (size = d+1)
+
+        """
+        self.YA = YA
+        self.YB = YB
+        self.c = self.coefficients()
+        self.C = self.derivative_coefficients()
+
+    def derivative_coefficients(self):
+        """Rearranges the parameter vector into the coefficients of y and its derivatives
+
+        Row j holds the coefficients of the j-th derivative in ascending powers of t,
+        so that np.dot(self.TMatrix(t), self.c) equals horner(C, t).
+
+        Returns:
+            C (ndarray): coefficient matrix (size = (d+1, 2d+2))
+
+        """
+        return derivative_coefficients(self.c, self.d + 1)
@@ -1,12 +1,18 @@
 from .BasePlanner import Planner
+from .horner import horner
 
 import numpy as np
 import math
-import scipy as sp
 from scipy import special
 
 class PrototypePlanner(Planner):
-    """Planner subclass that uses a polynomial approach for trajectory generation"""
+    """Planner subclass that uses a polynomial approach for trajectory generation
+
+    Attributes:
+        C (ndarray): coefficients of the prototype function and its derivatives in powers of
+            the normalized time (size = (d+1, 2d+2))
+
+    """
 
     def __init__(self, YA, YB, t0, tf, d):
         super().__init__(YA, YB, t0, tf, d)
@@ -15,6 +21,8 @@ class PrototypePlanner(Planner):
         if any(self.YA[1:]!=0) or any(self.YB[1:]!=0):
             print('Boundary conditions of the derivatives set to 0. All given values are ignored.')
 
+        self.C = self.coefficients()
+
     def eval(self, t):
         """Evaluates the planned trajectory at time t.
 
@@ -24,18 +32,7 @@ class PrototypePlanner(Planner):
                 Returns:
                     Y (ndarray): y and its derivatives at t
                 """
-
-        phi = self.prototype_fct((t - self.t0) / (self.tf - self.t0))
-        Y = np.zeros([(self.d + 1)])
-        if t < self.t0:
-            Y[0] = self.YA[0]
-        elif t > self.tf:
-            Y[0] = self.YB[0]
-        else:
-            Y[0] = self.YA[0] + (self.YB[0]-self.YA[0])*phi[0]
-            for i in range(1,self.d+1):
-                Y[i] = (1/(self.tf-self.t0))**i * (self.YB[0]-self.YA[0])*phi[i]
-        return Y
+        return self.eval_vec(np.array([t]))[0]
 
 
     def eval_vec(self,tt):
@@ -48,9 +45,18 @@ class PrototypePlanner(Planner):
             Y (ndarray): y and its derivatives at the sample points
 
         """
-        Y = np.zeros([len(tt),len(self.YA)])
-        for i in range(0,len(tt)):
-            Y[i] = self.eval(tt[i])
+        tt = np.asarray(tt, dtype=float)
+        phi = self.prototype_fct((tt - self.t0) / (self.tf - self.t0))
+
+        # scale the derivatives of phi to the interval [t0, tf]
+        scale = (1/(self.tf-self.t0))**np.arange(0, self.d+1) * (self.YB[0]-self.YA[0])
+        Y = phi * scale
+        Y[:, 0] += self.YA[0]
+
+        Y[tt < self.t0] = 0
+        Y[tt < self.t0, 0] = self.YA[0]
+        Y[tt > self.tf] = 0
+        Y[tt > self.tf, 0] = self.YB[0]
         return Y
 
 
@@ -62,34 +68,31 @@ class PrototypePlanner(Planner):
         Returns: phi (vector of phi and its successive derivatives)
 
         """
-        phi = np.zeros([self.d + 1])
+        return horner(self.C, t)
 
-        summation = sum([special.binom(self.d, k) * (-1) ** k * t ** (k + self.d + 1) / (self.d + k + 1)
-                         for k in range(0, self.d + 1)])
-        phi[0] = self.faculty(2 * self.d + 1) / (self.faculty(self.d) ** 2) * summation
 
-        # calculate it's derivatives up to order (d-1)
+    def coefficients(self):
+        """Expands the prototype function and its derivatives into polynomial coefficients
 
-        for p in range(1, self.d + 1):
-            summation = sum(
-                [sp.special.binom(self.d, k) * (-1) ** k * t ** (k + self.d + 1 - p) / (self.d + k + 1) * self.prod_iter(k, p)
-                 for k in range(0, self.d + 1)])
-            phi[p] = self.faculty(2 * self.d + 1) / (self.faculty(self.d) ** 2) * summation
-
-        return phi
-
-
-    def faculty(self, x):
-        """Calcualtes the faculty of x"""
-        result = 1
-        for i in range(2, x + 1):
-            result *= i
-        return result
+            phi(t) = (2d+1)!/(d!)^2 * sum_k binom(d, k) * (-1)^k * t^(k+d+1) / (d+k+1)
 
+        Returns:
+            C (ndarray): row p holds the coefficients of the p-th derivative of phi in
+                ascending powers of t (size = (d+1, 2d+2))
 
-    def prod_iter(self, k, p):
-        """Calculates the iterative product"""
-        result = 1
-        for i in range(1, p + 1):
-            result *= (self.d + k + 2 - i)
-        return result
\ No newline at end of file
+        """
+        d = self.d
+        m = 2*d + 2
+
+        # coefficients of phi itself
+        c = np.zeros([m])
+        for k in range(0, d + 1):
+            c[k + d + 1] = special.binom(d, k) * (-1) ** k / (d + k + 1)
+        c *= math.factorial(2*d + 1) / math.factorial(d) ** 2
+
+        # differentiating p times maps the coefficient of t^(i+p) to t^i
+        C = np.zeros([d + 1, m])
+        for p in range(0, d + 1):
+            for i in range(0, m - p):
+                C[p, i] = c[i + p] * math.factorial(i + p) / math.factorial(i)
+        return C
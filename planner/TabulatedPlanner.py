@@ -0,0 +1,136 @@
+from .BasePlanner import Planner
+from .PolynomialPlanner import boundary_inverse
+from .horner import horner_each, inverse_factorials
+
+import numpy as np
+
+from cache import cached
+
+class TabulatedPlanner(Planner):
+    """Planner subclass that samples another planner once and interpolates it.
+
+    The wrapped planner is sampled on a uniform grid of num points on [t0, tf]. Between two
+    grid points, the j-th derivative is interpolated by the Hermite polynomial of degree
+    2(d-j)+1 that matches the stored derivatives j, ..., d at both ends. A lookup only
+    computes the interval index, so its cost does not depend on the grid size or on the
+    wrapped planner. If the cache is enabled, the table is loaded from it.
+
+    Attributes:
+        planner (Planner): tabulated planner
+        tt (ndarray): sample grid
+        h (float): grid spacing
+        Y (ndarray): samples of y and its derivatives (size = (num, d+1))
+        C (ndarray): Hermite coefficients per interval in powers of the normalized interval
+            time (size = (num-1, d+1, 2d+2))
+        error_bound (ndarray): max. interpolation error of y and each derivative, measured
+            at the quarter points of every interval where the Hermite error term peaks (size = d+1)
+
+    """
+
+    def __init__(self, planner, num=1001, tol=None, max_num=1000001):
+        """
+        Args:
+            planner (Planner): planner to tabulate
+            num (int): number of grid points
+            tol (float): if given, the grid is refined until error_bound does not exceed tol
+            max_num (int): max. number of grid points used for refinement
+        """
+        super().__init__(planner.YA, planner.YB, planner.t0, planner.tf, planner.d)
+        self.planner = planner
+
+        self.tabulate(num)
+        while tol is not None and self.error_bound.max() > tol:
+            if 2*num - 1 > max_num:
+                print('Tabulation error {:.2e} exceeds the tolerance {:.2e} with {} grid points.'
+                      .format(self.error_bound.max(), tol, num))
+                break
+            num = 2*num - 1
+            self.tabulate(num)
+
+    def eval(self, t):
+        """Evaluates the planned trajectory at time t.
+
+        Args:
+            t (int, float): time
+
+        Returns:
+            Y (ndarray): y and its derivatives at t
+        """
+        if t < self.t0:
+            return self.Y_before
+        elif t > self.tf:
+            return self.Y_after
+
+        u = (t - self.t0) / self.h
+        k = min(int(u), len(self.C) - 1)
+        return np.dot(self.C[k], (u - k) ** self.powers)
+
+    def eval_vec(self, tt):
+        """Samples the planned trajectory
+
+        Args:
+            tt (ndarray): time vector
+
+        Returns:
+            Y (ndarray): y and its derivatives at the sample points
+
+        """
+        tt = np.asarray(tt, dtype=float)
+
+        # interval index and normalized time within the interval
+        u = (tt - self.t0) / self.h
+        k = np.clip(np.floor(u), 0, len(self.C) - 1).astype(int)
+        Y = horner_each(self.C[k], u - k)
+
+        Y[tt < self.t0] = self.Y_before
+        Y[tt > self.tf] = self.Y_after
+        return Y
+
+    def tabulate(self, num):
+        """Samples the wrapped planner and computes the Hermite coefficients of every interval
+
+        Args:
+            num (int): number of grid points
+
+        """
+        table = cached('TabulatedPlanner.tabulate', (self.planner, num), lambda: self.compute_table(num))
+        self.tt, self.h, self.Y, self.Y_before, self.Y_after, self.powers, self.C, self.error_bound = table
+
+    def compute_table(self, num):
+        """Computes the table of tabulate
+
+        Args:
+            num (int): number of grid points
+
+        Returns:
+            tuple of tt, h, Y, Y_before, Y_after, powers, C and error_bound
+
+        """
+        d = self.d
+        m = 2*d + 2
+
+        self.tt = np.linspace(self.t0, self.tf, num)
+        self.h = self.tt[1] - self.tt[0]
+        self.Y = self.planner.eval_vec(self.tt)
+
+        # all planners are constant outside of [t0, tf]
+        self.Y_before, self.Y_after = self.planner.eval_vec(np.array([self.t0 - self.h, self.tf + self.h]))
+
+        self.powers = np.arange(0, m)
+        self.C = np.zeros([num - 1, d + 1, m])
+        for j in range(0, d + 1):
+            q = d - j
+
+            # derivatives w.r.t. the normalized interval time at both ends
+            scale = self.h ** np.arange(0, q + 1)
+            D = np.append(self.Y[:-1, j:] * scale, self.Y[1:, j:] * scale, axis=1)
+
+            # Hermite polynomial in the scaled monomial basis of PolynomialPlanner
+            c = np.dot(D, boundary_inverse(0.0, 1.0, q).T)
+            self.C[:, j, 0:2*q + 2] = c * inverse_factorials(2*q + 2)
+
+        # compare against the wrapped planner inside every interval
+        tc = (self.tt[:-1, np.newaxis] + self.h * np.array([0.25, 0.5, 0.75])).ravel()
+        self.error_bound = np.abs(self.eval_vec(tc) - self.planner.eval_vec(tc)).max(axis=0)
+
+        return self.tt, self.h, self.Y, self.Y_before, self.Y_after, self.powers, self.C, self.error_bound
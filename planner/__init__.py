@@ -1,3 +1,6 @@
 from .PolynomialPlanner import PolynomialPlanner
 from .PrototypePlanner import PrototypePlanner
-from .GevreyPlanner import GevreyPlanner
\ No newline at end of file
+from .GevreyPlanner import GevreyPlanner
+from .PolynomialFleetPlanner import PolynomialFleetPlanner
+from .TabulatedPlanner import TabulatedPlanner
+from .PiecewisePolynomialPlanner import PiecewisePolynomialPlanner
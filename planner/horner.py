@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+
+def horner(C, t):
+    """Evaluates the rows of a coefficient matrix as polynomials in t using Horner's scheme.
+
+    Row j of C holds the coefficients of the j-th polynomial in ascending powers of t,
+    i.e. Y[j] = C[j, 0] + C[j, 1]*t + ... + C[j, m-1]*t**(m-1).
+
+    Args:
+        C (ndarray): coefficients, shape (..., n, m)
+        t (int, float, ndarray): evaluation point or time vector of shape (T,)
+
+    Returns:
+        Y (ndarray): polynomial values, shape (..., n) for scalar t, (..., T, n) otherwise
+    """
+    C = np.asarray(C, dtype=float)
+    t = np.asarray(t, dtype=float)
+    tt = np.atleast_1d(t)[:, np.newaxis]
+
+    Y = C[..., np.newaxis, :, -1] * np.ones_like(tt)
+    for k in range(C.shape[-1] - 2, -1, -1):
+        Y *= tt
+        Y += C[..., np.newaxis, :, k]
+
+    if t.ndim == 0:
+        return Y[..., 0, :]
+    return Y
+
+def horner_each(C, t):
+    """Evaluates one coefficient matrix per sample point using Horner's scheme.
+
+    Args:
+        C (ndarray): coefficients in ascending powers of t, shape (T, n, m)
+        t (ndarray): evaluation points, shape (T,)
+
+    Returns:
+        Y (ndarray): polynomial values, shape (T, n)
+    """
+    tt = np.asarray(t, dtype=float)[:, np.newaxis]
+
+    Y = np.array(C[..., -1], dtype=float)
+    for k in range(C.shape[-1] - 2, -1, -1):
+        Y *= tt
+        Y += C[..., k]
+    return Y
+
+def inverse_factorials(m):
+    """Inverse factorials 1/i! for i = 0, ..., m-1
+
+    Args:
+        m (int): number of factorials
+
+    Returns:
+        inv_fact (ndarray): inverse factorials, shape (m,)
+    """
+    return np.array([1 / math.factorial(i) for i in range(0, m)])
+
+def derivative_coefficients(c, n):
+    """Coefficients of a polynomial and its derivatives in ascending powers of t
+
+    The parameter vector holds the derivatives of the polynomial at t = 0, i.e.
+    y(t) = sum_i c[i] t**i / i!. Row j of the result holds the coefficients of the j-th
+    derivative, so that horner(C, t) evaluates y and its derivatives.
+
+    Args:
+        c (ndarray): parameter vectors, shape (..., m)
+        n (int): number of derivatives including y itself
+
+    Returns:
+        C (ndarray): coefficient matrices, shape (..., n, m)
+    """
+    c = np.asarray(c, dtype=float)
+    m = c.shape[-1]
+    inv_fact = inverse_factorials(m)
+
+    C = np.zeros(c.shape[:-1] + (n, m))
+    for j in range(0, n):
+        C[..., j, 0:m-j] = c[..., j:m] * inv_fact[0:m-j]
+    return C
@@ -1,43 +1,48 @@
 
 
 def run():
+	# # Persistent cache of compiled models, planner coefficients and tables
+	# import cache
+	# cache.enable()
+
 	# # Basic control simulation
 	# import sim_cases.basic_control
 
 	# # Trajectory planning - polynomial, prototype
 	# import sim_cases.traj_planning
 
+	# # Benchmark - sampling a planned trajectory
+	# import sim_cases.planner_benchmark
+
 	# # Feedforward control using a trajectory
 	# import sim_cases.ff_control
 
 	# # Feedback control
 	# import sim_cases.fb_control
-	
-	import numpy as np
-	import sympy as sp
-	
-	t = sp.Symbol('t')	
-	params = sp.symbols('m0, m1, J1, l1, a1, g, d0, d1')
-	F = sp.Symbol('F')
-	
-	m0, m1, J1, l1, a1, g, d0, d1 = params
-	params_values = [(m0, 3.34),
-					(m1, 0.3583),
-					(J1, 0.0379999),
-					(l1, 0.5),
-					(a1, 0.43),
-					(g, 9.81),
-					(d0, 0.1),
-					(d1, 0.006588)]
-					
-	q0_t = sp.Function('q0')(t)   
-	q1_t = sp.Function('q1')(t) 
-	
-	dq0_t = q0_t.diff(t)
-	dq1_t = q1_t.diff(t)
-	
-	ddq0_t = q0_t.diff(t, 2)
-	ddq1_t = q1_t.diff(t, 2)
+
+	# # Time-varying LQR tracking control
+	# import sim_cases.lqr_control
+
+	# # Feedback control with a sampled controller
+	# import sim_cases.sampled_control
+
+	# # Feedback control of an ensemble of cars
+	# import sim_cases.fleet_control
+
+	# # Parameter sweep of the feedback control
+	# import sim_cases.fb_sweep
+
+	# # Real-time stepping with a 1 kHz control loop
+	# import sim_cases.realtime_stepping
+
+	# # Tuning of the feedback gains
+	# import sim_cases.gain_tuning
+
+	# # Profile of the feedback control with a Gevrey timing planner
+	# import sim_cases.profiled_control
+
+	# Cart-pendulum derived with sympy and compiled to NumPy code
+	import sim_cases.cart_pendulum
 
 	
 # If run directly with Python
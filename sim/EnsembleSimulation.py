@@ -0,0 +1,130 @@
+import numpy as np
+
+from .Trajectory import time_grid
+from .integrators import rk4_step
+
+class EnsembleSimulation(object):
+	"""Simulation of an ensemble of N members in one vectorized integration.
+	
+		The initial states sim_params.x0 are stacked row-wise (size = (N, n)).
+		The ode function is called with a block of states (size = (n, N)) and
+		returns the block of state derivatives, so model parameters may be
+		scalars or arrays with one value per member. All members are advanced
+		together by the classical Runge-Kutta scheme with the fixed step size
+		dt / substeps.
+		
+		Events are checked after every output step. Event times and states are
+		found by linear interpolation within the step. Members that hit a
+		terminal event drop out of the block, the remaining samples of their
+		trajectories are NaN.
+		
+		Unlike Simulation, there are no adaptive solvers, checkpoints, dense
+		output or streaming, as they integrate a single state.
+		
+	Attributes:
+		status (int)		: 1 if a member hit a terminal event in the last run
+		t_events (dict)		: event name -> times of the events of the last run
+		x_events (dict)		: event name -> states at the events of the last run
+		m_events (dict)		: event name -> members at which the events occurred
+	"""
+	def __init__(self, sim_params, substeps=1):
+		self.t0 = sim_params.t0
+		self.tf = sim_params.tf
+		self.dt = sim_params.dt
+		self.x0 = sim_params.x0
+		self.substeps = substeps
+		
+	def simulate(self, odefunction, events=None, params=None):
+		"""Integrates all members of the ensemble.
+		
+		Args:
+			odefunction		: right hand side f(t, X) for a block of states
+			events (list)	: optional event functions, see events.named_event
+			params			: Parameters of the model; attributes holding one value
+							  per member are restricted to the members still in
+							  the block while integrating
+			
+		Returns:
+			t (ndarray)	: time vector (size = T)
+			x (ndarray)	: state trajectories (size = (N, T, n))
+		"""
+		tt = self.get_time_vector()
+		X = np.atleast_2d(np.asarray(self.x0, dtype=float)).T
+		N = X.shape[1]
+		events = events or []
+		
+		xx = np.full((len(tt),) + X.shape, np.nan)
+		xx[0] = X
+		
+		names = [getattr(e, 'name', e.__name__) for e in events]
+		self.t_events = {name: [] for name in names}
+		self.x_events = {name: [] for name in names}
+		self.m_events = {name: [] for name in names}
+		self.status = 0
+		
+		# per member parameters
+		members = {}
+		if params is not None:
+			members = {attr: value for attr, value in params
+				if isinstance(value, np.ndarray) and value.ndim > 0 and len(value) == N}
+				
+		active = np.arange(0, N)
+		G = [np.broadcast_to(e(tt[0], X), (N,)) for e in events]
+		try:
+			for i in range(1, len(tt)):
+				X_prev = X
+				h = (tt[i] - tt[i-1]) / self.substeps
+				for j in range(0, self.substeps):
+					X = rk4_step(odefunction, tt[i-1] + j*h, X, h)
+					
+				stop = np.zeros(len(active), dtype=bool)
+				for k in range(0, len(events)):
+					g_prev = G[k]
+					g = np.broadcast_to(events[k](tt[i], X), (len(active),))
+					direction = getattr(events[k], 'direction', 0)
+					
+					crossed = np.zeros(len(active), dtype=bool)
+					if direction >= 0:
+						crossed |= (g_prev < 0) & (g >= 0)
+					if direction <= 0:
+						crossed |= (g_prev > 0) & (g <= 0)
+						
+					# locate the zero crossing within the step
+					s = g_prev[crossed] / (g_prev[crossed] - g[crossed])
+					self.t_events[names[k]].extend(tt[i-1] + s * (tt[i] - tt[i-1]))
+					self.x_events[names[k]].extend((X_prev[:, crossed] + s * (X[:, crossed] - X_prev[:, crossed])).T)
+					self.m_events[names[k]].extend(active[crossed])
+					
+					if getattr(events[k], 'terminal', False):
+						stop |= crossed
+					G[k] = g
+					
+				keep = ~stop
+				xx[i][:, active[keep]] = X[:, keep]
+				if any(stop):
+					self.status = 1
+					active = active[keep]
+					X = X[:, keep]
+					G = [g[keep] for g in G]
+					for attr, value in members.items():
+						setattr(params, attr, value[active])
+					if len(active) == 0:
+						break
+		finally:
+			for attr, value in members.items():
+				setattr(params, attr, value)
+				
+		for name in names:
+			self.t_events[name] = np.array(self.t_events[name])
+			self.x_events[name] = np.array(self.x_events[name]).reshape([-1, X.shape[0]])
+			self.m_events[name] = np.array(self.m_events[name], dtype=int)
+			
+		return tt, np.transpose(xx, (2, 0, 1))
+		
+	def get_time_vector(self):
+		"""Output samples t0 + i*dt within [t0, tf]"""
+		return time_grid(self.t0, self.tf, self.dt)
+		
+	def get_num_samples(self):
+		"""Number of output samples t0 + i*dt within [t0, tf]"""
+		return len(self.get_time_vector())
@@ -0,0 +1,219 @@
+#! /usr/bin/python3
+
+# Profiler.py
+
+import json
+from time import perf_counter
+
+class Profiler(object):
+	"""Opt-in instrumentation of the components of a simulation.
+
+		Watched methods are only replaced by timing wrappers while the
+		profiler is active, i.e. inside a with block or a simulation that
+		was given the profiler, so there is no cost when profiling is
+		disabled. For every component the calls, the total time and the
+		self time, without the time of nested watched calls, are recorded.
+		Simulations also record the evaluations of the right hand side and
+		the steps of the solver.
+
+	Attributes:
+		calls (dict)		: component name -> number of calls
+		time (dict)			: component name -> total time in s
+		self_time (dict)	: component name -> time without nested components in s
+		solver (dict)		: statistics of the solver steps; nfev includes
+							  the evaluations for the dense output (dense_nfev),
+							  the rhs component also counts the evaluations of
+							  the solver for its initial step size
+		total_time (float)	: time of the profiled simulations in s
+	"""
+	def __init__(self):
+		self.targets = []
+		self.saved = []
+		self.reset()
+
+	def reset(self):
+		"""Clears the recorded statistics"""
+		self.calls = {}
+		self.time = {}
+		self.self_time = {}
+		self.stack = []
+		self.solver = {'method': None, 'steps': 0, 'rejected': 0, 'nfev': 0, 'dense_nfev': 0, 'njev': 0, 'nlu': 0,
+			'step_time': 0.0, 'max_step_time': 0.0}
+		self.total_time = 0.0
+
+	def watch(self, obj, *methods, name=None):
+		"""Adds methods of an object to the watched components.
+
+		Args:
+			obj				: instance, e.g. a model, controller or planner
+			methods (str)	: names of the methods, missing ones are skipped
+			name (str)		: prefix of the component names, defaults to the
+							  class name
+
+		Returns:
+			the profiler
+		"""
+		name = name or type(obj).__name__
+		for method in methods:
+			watched = any(target is obj and attr == method for target, attr, _ in self.targets)
+			if hasattr(obj, method) and not watched:
+				self.targets.append((obj, method, name + '.' + method))
+		return self
+
+	def watch_model(self, model):
+		"""Watches a model, its controller, the reference and the planners.
+
+		Args:
+			model (Model)	: model
+
+		Returns:
+			the profiler
+		"""
+		self.watch(model, 'ode', 'dynamics', 'jac')
+		controller = model.controller
+		if controller is None:
+			return self
+		self.watch(controller, 'control', 'control_jac')
+
+		ref = getattr(controller, 'ref', None)
+		if ref is not None:
+			self.watch(ref, 'eval', 'compose')
+		planners = getattr(controller, 'flo', None) or ()
+		for planner, name in zip(planners, ('flo_f', 'flo_g')):
+			self.watch(planner, 'eval', 'eval_vec', 'derivatives',
+				name='{}({})'.format(type(planner).__name__, name))
+		return self
+
+	def wrap(self, name, fct):
+		"""Timing wrapper of a function, recorded as the component name"""
+		def wrapper(*args, **kwargs):
+			frame = [0.0]
+			self.stack.append(frame)
+			start = perf_counter()
+			try:
+				return fct(*args, **kwargs)
+			finally:
+				elapsed = perf_counter() - start
+				self.stack.pop()
+				if self.stack:
+					self.stack[-1][0] += elapsed
+				self.calls[name] = self.calls.get(name, 0) + 1
+				self.time[name] = self.time.get(name, 0.0) + elapsed
+				self.self_time[name] = self.self_time.get(name, 0.0) + elapsed - frame[0]
+		return wrapper
+
+	def watched(self, fct):
+		"""Timing wrapper of a watched bound method captured before the profiler became active.
+		
+			Bound methods, e.g. model.ode passed to a simulation, keep the
+			original method when the wrappers are installed. They are wrapped
+			here under the name of their component, other functions are
+			returned unchanged.
+		"""
+		obj = getattr(fct, '__self__', None)
+		name = getattr(fct, '__name__', None)
+		for target, method, component in self.targets:
+			if target is obj and method == name:
+				return self.wrap(component, fct)
+		return fct
+
+	def __enter__(self):
+		missing = object()
+		for obj, method, name in self.targets:
+			self.saved.append((obj, method, vars(obj).get(method, missing), missing))
+			setattr(obj, method, self.wrap(name, getattr(obj, method)))
+		return self
+
+	def __exit__(self, *exc):
+		while self.saved:
+			obj, method, value, missing = self.saved.pop()
+			if value is missing:
+				delattr(obj, method)
+			else:
+				setattr(obj, method, value)
+		return False
+
+	def record_step(self, solver, elapsed, nfev):
+		"""Records a step of an OdeSolver.
+
+			Explicit Runge-Kutta methods evaluate the right hand side n_stages
+			times per attempted step, so the rejected attempts follow from the
+			evaluations of the step. They are not counted for other methods.
+
+		Args:
+			solver (OdeSolver)	: solver after the step
+			elapsed (float)		: time of the step in s
+			nfev (int)			: evaluations of the right hand side in the step
+		"""
+		stats = self.solver
+		stats['method'] = type(solver).__name__
+		stats['steps'] += 1
+		stats['nfev'] += nfev
+		stats['njev'] = int(solver.njev)
+		stats['nlu'] = int(solver.nlu)
+		stats['step_time'] += elapsed
+		stats['max_step_time'] = max(stats['max_step_time'], elapsed)
+
+		n_stages = getattr(solver, 'n_stages', None)
+		if n_stages is None:
+			stats['rejected'] = None
+		elif stats['rejected'] is not None:
+			stats['rejected'] += max(nfev // n_stages - 1, 0)
+
+	def record_dense_output(self, elapsed, nfev):
+		"""Records the interpolant of the last step of an OdeSolver.
+		
+			Some methods, e.g. DOP853, evaluate the right hand side again to
+			build the interpolant. These evaluations are added to nfev and to
+			the step time, but not used to infer the rejected steps.
+			
+		Args:
+			elapsed (float)	: time of the construction of the interpolant in s
+			nfev (int)		: evaluations of the right hand side
+		"""
+		stats = self.solver
+		stats['nfev'] += nfev
+		stats['dense_nfev'] += nfev
+		stats['step_time'] += elapsed
+
+	def report(self):
+		"""Recorded statistics as a dict of JSON serializable values.
+
+			The solver overhead is the time of the solver steps outside of
+			the right hand side.
+		"""
+		components = {}
+		for name in sorted(self.calls, key=lambda name: -self.time[name]):
+			components[name] = {'calls': self.calls[name], 'time': self.time[name],
+				'self_time': self.self_time[name]}
+
+		solver = dict(self.solver)
+		solver['overhead'] = solver['step_time'] - self.time.get('rhs', 0.0)
+		return {'total_time': self.total_time, 'components': components, 'solver': solver}
+
+	def table(self):
+		"""Summary of the report as a text table"""
+		report = self.report()
+		total = report['total_time'] or 1.0
+
+		lines = ['{:<36} {:>9} {:>10} {:>10} {:>7}'.format('component', 'calls', 'time/ms', 'self/ms', 'self/%')]
+		for name, stats in report['components'].items():
+			lines.append('{:<36} {:>9} {:>10.2f} {:>10.2f} {:>7.1f}'.format(name, stats['calls'],
+				1e3 * stats['time'], 1e3 * stats['self_time'], 100 * stats['self_time'] / total))
+
+		solver = report['solver']
+		lines.append('')
+		lines.append('solver {}: {} steps, {} rejected, {} rhs evaluations, {} jacobians, {} LU decompositions'
+			.format(solver['method'], solver['steps'], solver['rejected'], solver['nfev'], solver['njev'], solver['nlu']))
+		lines.append('step time {:.2f} ms (max. {:.3f} ms), solver overhead {:.2f} ms, total {:.2f} ms'
+			.format(1e3 * solver['step_time'], 1e3 * solver['max_step_time'], 1e3 * solver['overhead'],
+				1e3 * report['total_time']))
+		return '\n'.join(lines)
+
+	def to_json(self, path=None):
+		"""Report as JSON, written to path if given"""
+		text = json.dumps(self.report(), indent=1)
+		if path is not None:
+			with open(path, 'w') as f:
+				f.write(text)
+		return text
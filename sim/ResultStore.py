@@ -0,0 +1,192 @@
+#! /usr/bin/python3
+
+# ResultStore.py
+
+import os
+import json
+
+import numpy as np
+
+class ResultStore(object):
+	"""Simulation results in a run directory with one file per column.
+
+		Every column (t, x, u, ...) is a raw binary file of fixed width rows,
+		meta.json holds the dtypes, widths, number of rows and the metadata of
+		the run. Chunks can be appended, e.g. from Simulation.stream, and the
+		columns are opened lazily as read-only memory maps, so slices of many
+		stored runs can be analyzed without loading them into memory.
+
+		The number of rows is only updated in meta.json after the data of a
+		chunk is written, so an interrupted append leaves a consistent store.
+
+	Attributes:
+		path (str)		: run directory
+		metadata (dict)	: metadata of the run, see describe
+		length (int)	: number of stored rows
+	"""
+	def __init__(self, path, mode='r', metadata=None, dtype='float64'):
+		"""
+		Args:
+			path (str)		: run directory
+			mode (str)		: 'r' read, 'a' append to an existing or new
+							  store, 'w' replace an existing store
+			metadata (dict)	: metadata of a new store
+			dtype (str)		: dtype of the columns of a new store
+		"""
+		self.path = path
+		self.mode = mode
+		self.dtype = dtype
+		self.maps = {}
+
+		meta_file = os.path.join(path, 'meta.json')
+		if mode == 'w' or (mode == 'a' and not os.path.exists(meta_file)):
+			os.makedirs(path, exist_ok=True)
+			for name in os.listdir(path):
+				if name.endswith('.bin'):
+					os.remove(os.path.join(path, name))
+			self.columns = {}
+			self.length = 0
+			self.metadata = to_json(metadata or {})
+			self.write_meta()
+		elif mode in ('r', 'a'):
+			with open(meta_file) as f:
+				meta = json.load(f)
+			self.columns = meta['columns']
+			self.length = meta['length']
+			self.metadata = meta['metadata']
+		else:
+			raise ValueError('invalid mode ' + str(mode))
+
+	def append(self, t, x, u=None, **columns):
+		"""Appends a chunk of samples.
+
+		Args:
+			t (ndarray)		: sample times (size = T)
+			x (ndarray)		: states (size = (T, n))
+			u (ndarray)		: optional control inputs (size = (T, m))
+			columns			: further columns with T rows
+		"""
+		if self.mode == 'r':
+			raise RuntimeError('store is opened read-only')
+
+		columns = dict(columns, t=t, x=x)
+		if u is not None:
+			columns['u'] = u
+		data = {}
+		for name, values in columns.items():
+			values = np.asarray(values)
+			data[name] = values.reshape(len(values), -1)
+		n = len(data['t'])
+
+		for name in self.columns:
+			if name not in data:
+				raise ValueError('missing column ' + name)
+		for name, values in data.items():
+			if len(values) != n:
+				raise ValueError('column ' + name + ' has a different number of rows')
+			if name not in self.columns:
+				if self.length > 0:
+					raise ValueError('new column ' + name + ' in a non-empty store')
+				self.columns[name] = {'dtype': self.dtype, 'width': values.shape[1]}
+			elif values.shape[1] != self.columns[name]['width']:
+				raise ValueError('column ' + name + ' has a different width')
+
+		for name, values in data.items():
+			column = self.columns[name]
+			with open(self.column_file(name), 'r+b' if self.length > 0 else 'wb') as f:
+				# drop rows of an interrupted append
+				f.truncate(self.length * column['width'] * np.dtype(column['dtype']).itemsize)
+				f.seek(0, os.SEEK_END)
+				f.write(np.ascontiguousarray(values, dtype=column['dtype']).tobytes())
+
+		self.length += n
+		self.maps = {}
+		self.write_meta()
+
+	def __getitem__(self, name):
+		"""Read-only memory map of a column (size = (T, width), (T,) for t)"""
+		if name not in self.maps:
+			column = self.columns[name]
+			if self.length == 0:
+				values = np.empty([0, column['width']], dtype=column['dtype'])
+			else:
+				values = np.memmap(self.column_file(name), dtype=column['dtype'], mode='r',
+					shape=(self.length, column['width']))
+			if name == 't':
+				values = values[:, 0]
+			self.maps[name] = values
+		return self.maps[name]
+
+	def __contains__(self, name):
+		return name in self.columns
+
+	def __len__(self):
+		return self.length
+
+	@property
+	def t(self):
+		return self['t']
+
+	@property
+	def x(self):
+		return self['x']
+
+	@property
+	def u(self):
+		return self['u'] if 'u' in self.columns else None
+
+	def column_file(self, name):
+		return os.path.join(self.path, name + '.bin')
+
+	def write_meta(self):
+		meta = {'columns': self.columns, 'length': self.length, 'metadata': self.metadata}
+		meta_file = os.path.join(self.path, 'meta.json')
+		with open(meta_file + '.tmp', 'w') as f:
+			json.dump(meta, f, indent=1)
+		os.replace(meta_file + '.tmp', meta_file)
+
+def describe(sim=None, model=None, **metadata):
+	"""Collects the metadata of a run for a ResultStore.
+
+	Args:
+		sim (Simulation): simulation, its settings and solver method are stored
+		model (Model)	: model, its parameters and the types of its controller
+						  and planners are stored
+		metadata		: further entries, e.g. sweep parameters
+
+	Returns:
+		dict of JSON serializable values
+	"""
+	meta = {}
+	if sim is not None:
+		meta['sim'] = {'t0': sim.t0, 'tf': sim.tf, 'dt': sim.dt, 'x0': sim.x0,
+			'method': sim.method if isinstance(sim.method, str) else sim.method.__name__}
+	if model is not None:
+		meta['model'] = type(model).__name__
+		meta['params'] = model.params
+		controller = getattr(model, 'controller', None)
+		if controller is not None:
+			meta['controller'] = type(controller).__name__
+			meta['controller_params'] = controller.params
+			flo = getattr(controller, 'flo', None)
+			if flo is not None:
+				meta['planners'] = [type(planner).__name__ for planner in flo]
+	meta.update(metadata)
+	return to_json(meta)
+
+def to_json(value):
+	"""Converts numpy values, parameters and containers to JSON serializable values"""
+	if isinstance(value, dict):
+		return {str(key): to_json(item) for key, item in value.items()}
+	if isinstance(value, (list, tuple)):
+		return [to_json(item) for item in value]
+	if isinstance(value, np.ndarray):
+		return value.tolist()
+	if isinstance(value, np.generic):
+		return value.item()
+	if value is None or isinstance(value, (bool, int, float, str)):
+		return value
+	if hasattr(value, '__iter__') and hasattr(value, '__dict__'):
+		# Parameters
+		return to_json(dict(value))
+	return repr(value)
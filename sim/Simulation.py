@@ -1,9 +1,24 @@
+import copy
+from time import perf_counter
+
 import numpy as np
 import scipy.integrate as sci
 
-from .events import event
+from . import checkpoint as ckpt
+from .Trajectory import Trajectory, time_grid
+
+# methods that use the Jacobian of the ode function
+IMPLICIT_METHODS = ('Radau', 'BDF', 'LSODA')
 
 class Simulation(object):
+	"""Simulation of a model over [t0, tf] with output samples every dt.
+	
+	Attributes:
+		status (int)		: solver status of the last run, 1 if a terminal event occurred
+		profile (dict)		: report of the last profiled run, see Profiler.report
+		t_events (dict)		: event name -> times of the events of the last run
+		x_events (dict)		: event name -> states at the events of the last run
+	"""
 	def __init__(self, sim_params, method='RK45'):
 		self.t0 = sim_params.t0
 		self.tf = sim_params.tf
@@ -11,19 +26,304 @@ class Simulation(object):
 		self.x0 = sim_params.x0
 		self.method = method
 		
-	def simulate(self, odefunction):
+	def simulate(self, odefunction, control=None, jac=None, jac_sparsity=None, events=None,
+			checkpoint=None, checkpoint_every=1000, dense=False, profiler=None):
+		"""Integrates the ode function over [t0, tf].
+		
+		Args:
+			odefunction		: right hand side f(t, x)
+			control			: optional function mapping the sampled times and
+							  states to the control inputs, e.g. Model.inputs
+			jac				: optional Jacobian df/dx(t, x), e.g. Model.jac
+			jac_sparsity	: optional sparsity structure of the Jacobian, used
+							  for finite differences if jac is not given
+			events (list)	: optional event functions, see events.named_event;
+							  the samples end at the first terminal event
+			checkpoint (str): optional checkpoint file; the run is integrated
+							  in chunks and the output is saved after each
+							  chunk, see resume. The ode, control and jac
+							  functions must be picklable, e.g. bound methods
+							  of the model.
+			checkpoint_every (int): number of samples between checkpoints
+			dense (bool)	: return a Trajectory built on the dense output of
+							  the solver instead of the sampled arrays; cannot
+							  be combined with checkpoint
+			profiler (Profiler): optional profiler of the run; the solver is
+							  stepped manually to record its steps and the
+							  report is attached as self.profile
+			
+		Returns:
+			t (ndarray)		: sample times (size = T)
+			x (ndarray)		: states (size = (T, n))
+			u (ndarray)		: control inputs, only if control is given
+			
+			or, if dense is set, the Trajectory, which evaluates x(t) and
+			u(t) at arbitrary times within [t0, tf] on demand
+		"""
+		if profiler is not None:
+			if events or checkpoint is not None or dense:
+				raise ValueError('profiling only supports sampled runs without events')
+			return self.run_profiled(odefunction, control, jac, jac_sparsity, profiler)
+			
+		if checkpoint is not None:
+			if events:
+				raise ValueError('events are not supported with checkpoints')
+			if dense:
+				raise ValueError('dense output is not supported with checkpoints')
+			state = {
+				'sim': self,
+				'odefunction': odefunction,
+				'control': control,
+				'jac': jac,
+				'jac_sparsity': jac_sparsity,
+				'chunk_size': checkpoint_every
+				}
+			ckpt.write_header(checkpoint, state)
+			return self.run_checkpointed(checkpoint, state, [])
+			
 		tt = self.get_time_vector()
+		events = events or []
 		
 		sol = sci.solve_ivp(odefunction,
 			(self.t0, self.tf),
 			self.x0,
 			method=self.method,
-			t_eval=tt,
-			# events=event
+			t_eval=None if dense else tt,
+			dense_output=dense,
+			events=events or None,
+			**self.get_solver_options(jac, jac_sparsity)
 			)
 			
+		self.status = sol.status
+		self.t_events = {}
+		self.x_events = {}
+		for i in range(0, len(events)):
+			name = getattr(events[i], 'name', events[i].__name__)
+			self.t_events[name] = sol.t_events[i]
+			self.x_events[name] = sol.y_events[i]
+			
+		if dense:
+			# the solution ends at a terminal event
+			return Trajectory(sol.sol, self.t0, sol.t[-1], self.dt, control)
+		if control is not None:
+			return sol.t, sol.y.T, control(sol.t, sol.y.T)
 		return sol.t, sol.y.T
 		
+	def simulate_sampled(self, model, Ts):
+		"""Sampled-data simulation with a zero-order hold.
+		
+			The controller of the model is evaluated at the sample instants
+			t0 + k*Ts only and its output is held constant until the next
+			sample. The integration of model.dynamics is restarted at every
+			sample boundary.
+			
+		Args:
+			model (Model)	: model providing dynamics(t, x, u) and a controller
+			Ts (float)		: sample time of the controller
+			
+		Returns:
+			t (ndarray)		: sample times (size = T)
+			x (ndarray)		: states (size = (T, n))
+			u (ndarray)		: held control inputs (size = (T, m))
+		"""
+		tt = self.get_time_vector()
+		x = np.asarray(self.x0, dtype=float)
+		
+		xx = np.empty([len(tt), len(x)])
+		uu = None
+		
+		n = int(np.ceil((self.tf - self.t0) / Ts - 1e-9))
+		for k in range(0, n):
+			ta = self.t0 + k * Ts
+			tb = min(self.t0 + (k + 1) * Ts, self.tf)
+			
+			# output samples within [ta, tb), the last interval includes tf
+			i = np.searchsorted(tt, ta - 1e-9 * Ts)
+			j = np.searchsorted(tt, tb - 1e-9 * Ts) if k < n - 1 else len(tt)
+			
+			u = np.asarray(model.controller.control(ta, x))
+			if uu is None:
+				uu = np.empty([len(tt), len(u)])
+				
+			sol = sci.solve_ivp(lambda t, x : model.dynamics(t, x, u),
+				(ta, tb),
+				x,
+				method=self.method,
+				dense_output=True
+				)
+			if sol.status == -1:
+				raise RuntimeError(sol.message)
+				
+			if j > i:
+				xx[i:j] = sol.sol(tt[i:j]).T
+				uu[i:j] = u
+			x = sol.y[:, -1]
+			
+		return tt, xx, uu
+		
+	def run_profiled(self, odefunction, control, jac, jac_sparsity, profiler):
+		"""Runs simulate through stream with the profiler active"""
+		start = perf_counter()
+		with profiler:
+			chunks = list(self.stream(odefunction, self.get_num_samples(), control, jac, jac_sparsity,
+				profiler))
+		profiler.total_time += perf_counter() - start
+		
+		self.status = 0
+		self.t_events = {}
+		self.x_events = {}
+		self.profile = profiler.report()
+		
+		t, x, u = chunks[0]
+		if control is not None:
+			return t, x, u
+		return t, x
+		
+	def stream(self, odefunction, chunk_size=1000, control=None, jac=None, jac_sparsity=None,
+			profiler=None):
+		"""Integrates in chunks and yields the results incrementally.
+		
+			A single solver instance is stepped across chunk boundaries and
+			the output samples t0 + i*dt are interpolated from its dense
+			output, so memory use is bounded by the chunk size and not by
+			the length of the horizon.
+			
+		Args:
+			odefunction		: right hand side f(t, x)
+			chunk_size (int): max. number of samples per chunk
+			control			: optional function mapping the sampled times and
+							  states of a chunk to the control inputs, e.g.
+							  Model.inputs
+			jac				: optional Jacobian df/dx(t, x), e.g. Model.jac
+			jac_sparsity	: optional sparsity structure of the Jacobian
+			profiler (Profiler): optional profiler recording the evaluations
+							  of the ode function and the solver steps
+			
+		Yields:
+			t_chunk (ndarray)	: sample times (size = T)
+			x_chunk (ndarray)	: states (size = (T, n))
+			u_chunk (ndarray)	: control inputs, None if no control is given
+		"""
+		if profiler is not None:
+			odefunction = profiler.wrap('rhs', profiler.watched(odefunction))
+			if jac is not None:
+				jac = profiler.watched(jac)
+		solver_class = getattr(sci, self.method) if isinstance(self.method, str) else self.method
+		solver = solver_class(odefunction, self.t0, np.asarray(self.x0, dtype=float), self.tf,
+			**self.get_solver_options(jac, jac_sparsity))
+		interpolant = None
+		
+		n = self.get_num_samples()
+		i = 0
+		while i < n:
+			t_chunk = np.minimum(self.t0 + (i + np.arange(0, min(chunk_size, n - i))) * self.dt, self.tf)
+			x_chunk = np.empty([len(t_chunk), solver.n])
+			k = 0
+			while k < len(t_chunk):
+				# samples covered by the last step
+				j = np.searchsorted(t_chunk, solver.t, side='right')
+				if j > k and interpolant is None:
+					# initial state
+					x_chunk[k] = solver.y
+					k += 1
+				elif j > k:
+					x_chunk[k:j] = interpolant(t_chunk[k:j]).T
+					k = j
+				else:
+					nfev = solver.nfev
+					start = perf_counter()
+					solver.step()
+					if profiler is not None:
+						profiler.record_step(solver, perf_counter() - start, solver.nfev - nfev)
+					if solver.status == 'failed':
+						raise RuntimeError(solver.message)
+					nfev = solver.nfev
+					start = perf_counter()
+					interpolant = solver.dense_output()
+					if profiler is not None:
+						profiler.record_dense_output(perf_counter() - start, solver.nfev - nfev)
+			i += k
+			
+			u_chunk = control(t_chunk, x_chunk) if control is not None else None
+			yield t_chunk, x_chunk, u_chunk
+		
+	@staticmethod
+	def resume(path, new_tf=None):
+		"""Continues a checkpointed run from its last saved sample.
+		
+			Only the samples after the last checkpoint are integrated, e.g.
+			after an interrupted run or to extend the horizon to new_tf. The
+			integrator restarts at the last saved state.
+			
+		Args:
+			path (str)		: checkpoint file written by simulate
+			new_tf (float)	: optional new end time
+			
+		Returns:
+			t (ndarray)		: sample times of the whole run (size = T)
+			x (ndarray)		: states (size = (T, n))
+			u (ndarray)		: control inputs, only if the run has a control
+		"""
+		state, chunks = ckpt.load(path)
+		sim = state['sim']
+		if new_tf is not None and new_tf != sim.tf:
+			sim.tf = new_tf
+			ckpt.append_record(path, 'run', state)
+		return sim.run_checkpointed(path, state, chunks)
+		
+	def run_checkpointed(self, path, state, chunks):
+		"""Integrates the samples missing from the chunks and appends them to the checkpoint"""
+		n = self.get_num_samples()
+		k = sum(len(t) for t, _, _ in chunks)
+		
+		if k < n:
+			# restart at the last saved sample, which is not repeated
+			segment = copy.copy(self)
+			if k > 0:
+				segment.t0 = chunks[-1][0][-1]
+				segment.x0 = chunks[-1][1][-1]
+			skip = 1 if k > 0 else 0
+			
+			stream = segment.stream(state['odefunction'], state['chunk_size'], state['control'],
+				state['jac'], state['jac_sparsity'])
+			for t_chunk, x_chunk, u_chunk in stream:
+				m = min(len(t_chunk) - skip, n - k)
+				chunk = (np.minimum(self.t0 + np.arange(k, k + m) * self.dt, self.tf),
+					x_chunk[skip:skip + m],
+					u_chunk[skip:skip + m] if u_chunk is not None else None)
+				ckpt.append_record(path, 'chunk', chunk)
+				chunks.append(chunk)
+				k += m
+				skip = 0
+				if k >= n:
+					break
+					
+		self.status = 0
+		self.t_events = {}
+		self.x_events = {}
+		
+		# the horizon may have been shortened
+		t = np.concatenate([c[0] for c in chunks])[:n]
+		x = np.concatenate([c[1] for c in chunks])[:n]
+		if state['control'] is not None:
+			return t, x, np.concatenate([c[2] for c in chunks])[:n]
+		return t, x
+		
+	def get_solver_options(self, jac, jac_sparsity):
+		"""Jacobian options for the solver, only passed to implicit methods"""
+		if self.method not in IMPLICIT_METHODS:
+			return {}
+		if jac is not None:
+			return {'jac': jac}
+		if jac_sparsity is not None and self.method != 'LSODA':
+			return {'jac_sparsity': jac_sparsity}
+		return {}
+		
 	def get_time_vector(self):
-		return np.arange(self.t0, self.tf + self.dt, self.dt)
+		"""Output samples t0 + i*dt within [t0, tf], see get_num_samples"""
+		return time_grid(self.t0, self.tf, self.dt)
+		
+	def get_num_samples(self):
+		"""Number of output samples t0 + i*dt within [t0, tf]"""
+		return int(np.floor((self.tf - self.t0) / self.dt + 1e-9)) + 1
 		
@@ -0,0 +1,113 @@
+import numpy as np
+from time import perf_counter
+
+class Stepper(object):
+	"""Advances a model by one control period at a time.
+	
+		The inputs are injected from outside through step() and passed to
+		model.dynamics(t, x, u). Each step is integrated with the classical
+		Runge-Kutta scheme on preallocated buffers, so no solver is set up
+		per step. The compute time of every step is recorded and counted as
+		a deadline miss if it exceeds the target period.
+		
+	Attributes:
+		t (float)			: current time
+		period (float)		: target period, default step size and deadline
+		latency (ndarray)	: compute time of the last steps in s (ring buffer)
+		steps (int)			: number of steps since the last reset
+		misses (int)		: number of steps whose compute time exceeded the period
+	"""
+	def __init__(self, model, period, substeps=1, history=100000):
+		"""
+		Args:
+			model (Model)	: model providing dynamics(t, x, u)
+			period (float)	: target period in s
+			substeps (int)	: Runge-Kutta steps per call of step()
+			history (int)	: number of latencies kept
+		"""
+		self.model = model
+		self.period = period
+		self.substeps = substeps
+		self.latency = np.zeros([history])
+		
+	def reset(self, x0, t0=0):
+		"""Sets the initial state and clears the latency records.
+		
+		Args:
+			x0		: initial state
+			t0		: initial time
+		"""
+		self.t = t0
+		self._x = np.array(x0, dtype=float)
+		self._k = np.empty((4,) + self._x.shape)
+		self._tmp = np.empty_like(self._x)
+		
+		self.latency[:] = 0
+		self.steps = 0
+		self.misses = 0
+		
+	@property
+	def state(self):
+		return self._x.copy()
+		
+	def step(self, u, dt=None):
+		"""Advances the model by one period with the input held constant.
+		
+		Args:
+			u		: input
+			dt		: step size, defaults to the period
+			
+		Returns:
+			x		: state after the step
+		"""
+		start = perf_counter()
+		
+		f = self.model.dynamics
+		x, k, tmp = self._x, self._k, self._tmp
+		h = (self.period if dt is None else dt) / self.substeps
+		
+		for j in range(0, self.substeps):
+			t = self.t
+			k[0] = f(t, x, u)
+			np.multiply(k[0], h/2, out=tmp)
+			tmp += x
+			k[1] = f(t + h/2, tmp, u)
+			np.multiply(k[1], h/2, out=tmp)
+			tmp += x
+			k[2] = f(t + h/2, tmp, u)
+			np.multiply(k[2], h, out=tmp)
+			tmp += x
+			k[3] = f(t + h, tmp, u)
+			
+			# x += h/6 * (k1 + 2*k2 + 2*k3 + k4)
+			np.add(k[1], k[2], out=tmp)
+			tmp *= 2
+			tmp += k[0]
+			tmp += k[3]
+			tmp *= h/6
+			x += tmp
+			self.t = t + h
+			
+		latency = perf_counter() - start
+		self.latency[self.steps % len(self.latency)] = latency
+		self.steps += 1
+		if latency > self.period:
+			self.misses += 1
+			
+		return self.state
+		
+	def stats(self):
+		"""Summary of the recorded compute times.
+		
+		Returns:
+			dict with the number of steps and deadline misses and the mean,
+			99th percentile and max. latency in s
+		"""
+		latency = self.latency[:min(self.steps, len(self.latency))]
+		if len(latency) == 0:
+			latency = np.zeros([1])
+		return {'steps': self.steps,
+				'misses': self.misses,
+				'mean': np.mean(latency),
+				'p99': np.percentile(latency, 99),
+				'max': np.max(latency)}
@@ -0,0 +1,103 @@
+#! /usr/bin/python3
+
+# Trajectory.py
+
+import numpy as np
+
+class Trajectory(object):
+	"""Lazily evaluated solution of a simulation.
+
+		The states are interpolated from the dense output of the solver, so
+		they can be queried at arbitrary times without integrating again. The
+		sampled arrays t, x and u are only computed on first access.
+
+	Attributes:
+		t0, tf (float)	: time interval of the solution
+		dt (float)		: step of the sample grid t0 + i*dt
+	"""
+	def __init__(self, sol, t0, tf, dt, control=None):
+		"""
+		Args:
+			sol				: dense output of the solver, OdeSolution
+			t0, tf (float)	: time interval of the solution
+			dt (float)		: step of the sample grid
+			control			: optional function mapping times and states to
+							  the control inputs, e.g. Model.inputs
+		"""
+		self.sol = sol
+		self.t0 = t0
+		self.tf = tf
+		self.dt = dt
+		self.control = control
+		self.samples = {}
+
+	def __call__(self, t):
+		"""States at the times t.
+
+		Args:
+			t (float or ndarray): times within [t0, tf] (size = T)
+
+		Returns:
+			x (ndarray)	: states (size = (n,) for a scalar t, else (T, n))
+		"""
+		if np.ndim(t) == 0:
+			return self.sol(t)
+		return self.sol(np.asarray(t)).T
+
+	def inputs(self, t):
+		"""Control inputs at the times t, evaluated at the interpolated states.
+
+		Args:
+			t (float or ndarray): times within [t0, tf] (size = T)
+
+		Returns:
+			u (ndarray)	: control inputs (size = (m,) for a scalar t, else (T, m))
+		"""
+		if self.control is None:
+			raise RuntimeError('trajectory has no control')
+		if np.ndim(t) == 0:
+			return np.asarray(self.control(np.array([t]), self(np.array([t]))))[0]
+		t = np.asarray(t)
+		return np.asarray(self.control(t, self(t)))
+
+	def sample(self, dt=None):
+		"""Samples the solution on the grid t0 + i*dt within [t0, tf].
+
+		Args:
+			dt (float)	: step, defaults to the step of the simulation
+
+		Returns:
+			t (ndarray)	: sample times (size = T)
+			x (ndarray)	: states (size = (T, n))
+			u (ndarray)	: control inputs, only if a control is given
+		"""
+		tt = time_grid(self.t0, self.tf, dt or self.dt)
+		if self.control is not None:
+			return tt, self(tt), self.inputs(tt)
+		return tt, self(tt)
+
+	@property
+	def t(self):
+		"""Sample times of the simulation grid"""
+		if 't' not in self.samples:
+			self.samples['t'] = time_grid(self.t0, self.tf, self.dt)
+		return self.samples['t']
+
+	@property
+	def x(self):
+		"""States at the sample times"""
+		if 'x' not in self.samples:
+			self.samples['x'] = self(self.t)
+		return self.samples['x']
+
+	@property
+	def u(self):
+		"""Control inputs at the sample times"""
+		if 'u' not in self.samples:
+			self.samples['u'] = self.inputs(self.t)
+		return self.samples['u']
+
+def time_grid(t0, tf, dt):
+	"""Sample times t0 + i*dt within [t0, tf], computed from the sample index"""
+	n = int(np.floor((tf - t0) / dt + 1e-9)) + 1
+	return np.minimum(t0 + np.arange(0, n) * dt, tf)
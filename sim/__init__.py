@@ -1,2 +1,9 @@
 from .Simulation import Simulation
+from .EnsembleSimulation import EnsembleSimulation
+from .Stepper import Stepper
+from .Profiler import Profiler
+from .Trajectory import Trajectory
+from .events import named_event, bounds_exceeded, goal_reached, tracking_error
+from .ResultStore import ResultStore, describe
+from .sweep import sweep, parameter_grid
 from .plotter import plt, plot_data
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import pickle
+
+# Checkpoint files are an append-only sequence of pickled records:
+#	('run', state)				: simulation, ode function, control and solver options
+#	('chunk', (t, x, u))		: output samples of one chunk
+# A later 'run' record replaces an earlier one, e.g. after a resume with a new
+# end time. A truncated last record, left by an interrupted write, is ignored.
+
+def write_header(path, state):
+	"""Starts a new checkpoint file with the given run state"""
+	tmp = path + '.tmp'
+	with open(tmp, 'wb') as f:
+		pickle.dump(('run', state), f, protocol=pickle.HIGHEST_PROTOCOL)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp, path)
+
+def append_record(path, kind, data):
+	"""Appends a record and flushes it to disk"""
+	with open(path, 'ab') as f:
+		pickle.dump((kind, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+		f.flush()
+		os.fsync(f.fileno())
+
+def load(path):
+	"""Reads a checkpoint file.
+
+		A truncated last record is cut off the file, so that new records
+		can be appended.
+
+	Args:
+		path (str)		: checkpoint file
+
+	Returns:
+		state (dict)	: latest run state
+		chunks (list)	: output chunks (t, x, u) in order
+	"""
+	state = None
+	chunks = []
+	with open(path, 'r+b') as f:
+		end = 0
+		while True:
+			try:
+				kind, data = pickle.load(f)
+			except (EOFError, pickle.UnpicklingError, ValueError, TypeError):
+				break
+			end = f.tell()
+			if kind == 'run':
+				state = data
+			else:
+				chunks.append(data)
+		f.truncate(end)
+
+	if state is None:
+		raise ValueError('no checkpoint in ' + path)
+	return state, chunks
@@ -2,8 +2,63 @@
 
 import numpy as np
 
+def named_event(fct, name, terminal=False, direction=0):
+    """Sets the attributes of an event function used by the simulations.
+
+    An event occurs where the scalar event function crosses zero. For a block of
+    states (size = (n, N)) it returns one value per member.
+
+    Args:
+        fct: event function g(t, x)
+        name (str): key of the event in the simulation results
+        terminal (bool): stop the integration (of the member) at the event
+        direction (int): only count crossings from negative to positive (1),
+            from positive to negative (-1) or both (0)
+
+    Returns:
+        fct
+    """
+    fct.name = name
+    fct.terminal = terminal
+    fct.direction = direction
+    return fct
+
+def bounds_exceeded(x_max, terminal=True):
+    """Event when any state component leaves [-x_max, x_max]
+
+    Args:
+        x_max (float, ndarray): bound, scalar or one per state component
+    """
+    x_max = np.asarray(x_max, dtype=float)
+
+    def g(t, x):
+        bound = np.reshape(x_max, x_max.shape + (1,) * (np.ndim(x) - x_max.ndim))
+        return np.max(np.abs(x) - bound, axis=0)
+
+    return named_event(g, 'bounds_exceeded', terminal, 1)
+
+def goal_reached(xf, radius, terminal=True):
+    """Event when the position (x1, x2) comes within radius of the goal xf"""
+    def g(t, x):
+        return np.hypot(x[0] - xf[0], x[1] - xf[1]) - radius
+
+    return named_event(g, 'goal_reached', terminal, -1)
+
+def tracking_error(reference, threshold, terminal=False):
+    """Event when the position (x1, x2) deviates from the reference by more than threshold
+
+    Args:
+        reference: object whose eval(t) returns the desired y1 and y2 first, e.g. a FlatTrajectory
+        threshold (float): max. distance to the desired position
+    """
+    def g(t, x):
+        ref = reference.eval(t)
+        return np.hypot(x[0] - ref[0], x[1] - ref[1]) - threshold
+
+    return named_event(g, 'tracking_error', terminal, 1)
+
 def event(t, x):
     x_max = 5
-    return np.abs(x)-x_max
+    return np.max(np.abs(x)) - x_max
 
-event.terminal = True
\ No newline at end of file
+event.terminal = True
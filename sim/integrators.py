@@ -0,0 +1,21 @@
+#! /usr/bin/python3
+
+# integrators.py
+
+def rk4_step(odefunction, t, x, h):
+	"""Advances the state by one step of the classical Runge-Kutta scheme.
+	
+	Args:
+		odefunction	: right hand side f(t, x)
+		t			: time
+		x (ndarray)	: state, or block of states with the members along the last axis
+		h (float)	: step size
+		
+	Returns:
+		x (ndarray)	: state at t + h
+	"""
+	k1 = odefunction(t, x)
+	k2 = odefunction(t + h/2, x + h/2 * k1)
+	k3 = odefunction(t + h/2, x + h/2 * k2)
+	k4 = odefunction(t + h, x + h * k3)
+	return x + h/6 * (k1 + 2*k2 + 2*k3 + k4)
@@ -0,0 +1,109 @@
+#! /usr/bin/python3
+
+# sweep.py
+
+import os
+import itertools
+from concurrent import futures
+
+import numpy as np
+
+from .ResultStore import ResultStore
+
+def parameter_grid(grid):
+	"""Expands a grid into the list of all parameter combinations.
+	
+	Args:
+		grid (dict): parameter name -> list of values
+		
+	Returns:
+		list of dicts, one per combination
+	"""
+	names = list(grid)
+	return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+	
+def sweep(factory, grid=None, sampler=None, num=None, metrics=None, decimate=None,
+	seed=0, max_workers=None, chunksize=1, store=None):
+	"""Runs a scenario for many parameter sets on a process pool.
+	
+		The parameter sets are either all combinations of a grid or num draws
+		of a random sampler. Every run gets its own seed, derived from seed and
+		the run index only, so results do not depend on the number of workers
+		or the order in which runs complete. Before a run, the global numpy
+		random state of the worker is seeded with it.
+		
+		factory, sampler and metrics are sent to the worker processes and
+		have to be picklable, i.e. defined at module level of a module that
+		does not start the sweep while it is being imported.
+		
+	Args:
+		factory			: scenario, maps a parameter dict to (t, x, u)
+		grid (dict)		: parameter name -> list of values
+		sampler			: maps a numpy Generator to a parameter dict
+		num (int)		: number of sampled parameter sets
+		metrics (dict)	: metric name -> function of (t, x, u) returning a scalar
+		decimate (int)	: if given, every decimate-th sample of the trajectories is returned
+		seed (int)		: root seed of the sweep
+		max_workers (int): number of processes, defaults to the number of cores
+		chunksize (int)	: number of runs sent to a worker at once
+		store (str)		: if given, the workers write the full trajectory of
+						  each run to a ResultStore in store/run_<index>
+		
+	Yields:
+		result (dict)	: index, params, seed, metrics and optionally the
+						  decimated trajectory (t, x, u) and the path of the
+						  stored trajectory of each run, in order of completion
+	"""
+	if grid is not None:
+		param_sets = parameter_grid(grid)
+	else:
+		param_sets = None
+		
+	n = len(param_sets) if param_sets is not None else num
+	seeds = np.random.SeedSequence(seed).spawn(n)
+	
+	tasks = []
+	for i in range(0, n):
+		if param_sets is not None:
+			params = param_sets[i]
+		else:
+			params = sampler(np.random.default_rng(seeds[i]))
+		tasks.append((i, params, int(seeds[i].generate_state(1)[0])))
+		
+	chunks = [tasks[i:i + chunksize] for i in range(0, n, chunksize)]
+	
+	with futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+		pending = [pool.submit(run_chunk, factory, metrics, decimate, chunk, store) for chunk in chunks]
+		for future in futures.as_completed(pending):
+			for result in future.result():
+				yield result
+				
+def run_chunk(factory, metrics, decimate, tasks, store=None):
+	"""Runs a chunk of a sweep inside a worker process.
+	
+	Args:
+		factory			: scenario, maps a parameter dict to (t, x, u)
+		metrics (dict)	: metric name -> function of (t, x, u)
+		decimate (int)	: step of the returned trajectory samples, None for no trajectories
+		tasks (list)	: tuples of run index, parameter dict and seed
+		store (str)		: root directory of the stored trajectories, None for no storage
+		
+	Returns:
+		list of result dicts
+	"""
+	results = []
+	for index, params, seed in tasks:
+		np.random.seed(seed)
+		t, x, u = factory(params)
+		
+		result = {'index': index, 'params': params, 'seed': seed, 'metrics': {}}
+		for name, metric in (metrics or {}).items():
+			result['metrics'][name] = float(metric(t, x, u))
+		if decimate is not None:
+			result['trajectory'] = (t[::decimate], x[::decimate], u[::decimate])
+		if store is not None:
+			path = os.path.join(store, 'run_%06d' % index)
+			ResultStore(path, 'w', {'params': params, 'seed': seed}).append(t, x, u)
+			result['store'] = path
+		results.append(result)
+	return results
@@ -23,15 +23,13 @@ def run_sim(model):
 	odefunction = lambda t, x : model.ode(t, x)
 	sim_params = set_sim_parameters()
 	sim = Simulation(sim_params)
-	return sim.simulate(odefunction)
+	return sim.simulate(odefunction, model.inputs)
 
 
 
 model = init_model()
 
-tsim, xsim = run_sim(model)
-
-usim = model.controller.control(tsim, xsim)
+tsim, xsim, usim = run_sim(model)
 
 plot_data(tsim, xsim, usim)
 # car_animation(tsim, xsim, usim, model.params)
@@ -0,0 +1,68 @@
+# Cart-pendulum model derived with sympy and compiled to NumPy code
+
+from model import compile_model, state_space, Parameters
+from sim import Simulation, plt
+
+import numpy as np
+import sympy as sp
+
+t = sp.Symbol('t')
+params = sp.symbols('m0, m1, J1, l1, a1, g, d0, d1')
+F = sp.Symbol('F')
+
+m0, m1, J1, l1, a1, g, d0, d1 = params
+params_values = [(m0, 3.34),
+				(m1, 0.3583),
+				(J1, 0.0379999),
+				(l1, 0.5),
+				(a1, 0.43),
+				(g, 9.81),
+				(d0, 0.1),
+				(d1, 0.006588)]
+				
+q0_t = sp.Function('q0')(t)
+q1_t = sp.Function('q1')(t)
+
+dq0_t = q0_t.diff(t)
+dq1_t = q1_t.diff(t)
+
+# cart position q0, pendulum angle q1 from the upright position,
+# centre of gravity of the pendulum at distance a1 from the joint
+x1 = q0_t + a1 * sp.sin(q1_t)
+y1 = a1 * sp.cos(q1_t)
+
+T = (m0 * dq0_t**2 + m1 * (x1.diff(t)**2 + y1.diff(t)**2) + J1 * dq1_t**2) / 2
+V = m1 * g * y1
+L = T - V
+
+# Lagrange equations with the force F on the cart and viscous friction
+eqs = [L.diff(dq0_t).diff(t) - L.diff(q0_t) - F + d0 * dq0_t,
+	L.diff(dq1_t).diff(t) - L.diff(q1_t) + d1 * dq1_t]
+	
+x, f = state_space(eqs, [q0_t, q1_t], t)
+CartPendulum = compile_model(f, x, [F], params_values, name='CartPendulum')
+
+def get_sim_parameters():
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.01
+	sim_params.x0 = [0, 0.1, 0, 0]
+	return sim_params
+	
+model = CartPendulum()
+sim = Simulation(get_sim_parameters())
+
+# pendulum falling from a tilted position without force on the cart
+tsim, xsim = sim.simulate(lambda t, x : model.dynamics(t, x, [0]), jac_sparsity=model.jac_sparsity)
+
+fig, (ax1, ax2) = plt.subplots(2)
+ax1.plot(tsim, xsim[:, 0], lw=1, color='r')
+ax1.set_title('Cart position')
+ax1.set_ylabel(r'm')
+ax2.plot(tsim, np.rad2deg(xsim[:, 1]), lw=1, color='b')
+ax2.set_title('Pendulum angle')
+ax2.set_ylabel(r'deg')
+ax2.set_xlabel(r't in s')
+plt.tight_layout()
+plt.show()
@@ -68,21 +68,21 @@ def run_sim(model):
 	odefunction = lambda t, x : model.ode(t, x)
 	sim_params = get_sim_parameters()
 	sim = Simulation(sim_params)
-	return sim.simulate(odefunction)
+	return sim.simulate(odefunction, model.inputs, jac=model.jac, jac_sparsity=model.jac_sparsity)
 
 model = init_model()
 
 flo = generate_trajectory()
 model.controller = FeedbackController(flo, model.params)
 
+# the feedback law queries the reference at every solver stage
+sim_params = get_sim_parameters()
+model.controller.ref.tabulate(sim_params.t0, sim_params.tf, 1e-3)
+
 controller = model.controller
 controller.params.append(get_controller_params())
 
-tsim, xsim = run_sim(model)
-
-usim = np.zeros([len(tsim),2])
-for i in range(0, len(tsim)):
-    usim[i] = model.controller.control(tsim[i], xsim[i])
+tsim, xsim, usim = run_sim(model)
 
 plot_data(tsim, xsim, usim)
 car_animation(tsim, xsim, usim, model.params)
@@ -0,0 +1,56 @@
+# Feedback control scenario for parameter sweeps
+#
+# Defines the scenario factory and metrics only, so that sweep workers can
+# import it without side effects.
+
+from car import Car
+from planner import PolynomialPlanner
+from controller import FeedbackController
+
+from model import Parameters
+from sim import Simulation
+
+import numpy as np
+from numpy import tan
+
+def get_sim_parameters():
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.04
+	sim_params.x0 = [0, 0.2, 0]
+	sim_params.xf = [5, 5, 0]
+	return sim_params
+	
+def generate_trajectory(sim_params):
+	flo_f = PolynomialPlanner(np.array([0, tan(0), 0]),
+			np.array([sim_params.xf[1], tan(sim_params.xf[2]), 0]),
+			0,
+			sim_params.xf[0],
+			2)
+	flo_g = PolynomialPlanner(np.array([0, 0]),
+			np.array([sim_params.xf[0], 0]),
+			sim_params.t0 + 1,
+			sim_params.tf - 1,
+			1)
+	return flo_f, flo_g
+	
+def fb_scenario(p):
+	"""Feedback control scenario for the gains k01, k02, k12 and the car length l"""
+	sim_params = get_sim_parameters()
+	
+	model = Car()
+	model.set_params(l=p['l'])
+	model.controller = FeedbackController(generate_trajectory(sim_params), model.params)
+	model.controller.ref.tabulate(sim_params.t0, sim_params.tf, 1e-3)
+	model.params.append({'k01': p['k01'], 'k02': p['k02'], 'k12': p['k12']})
+	
+	odefunction = lambda t, x : model.ode(t, x)
+	return Simulation(sim_params).simulate(odefunction, model.inputs)
+	
+def final_error(t, x, u):
+	xf = get_sim_parameters().xf
+	return np.hypot(x[-1, 0] - xf[0], x[-1, 1] - xf[1])
+	
+def max_steering(t, x, u):
+	return np.max(np.abs(u[:, 1]))
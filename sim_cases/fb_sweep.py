@@ -0,0 +1,20 @@
+# Parameter sweep of the feedback control
+
+from sim import sweep
+
+from sim_cases.fb_scenario import fb_scenario, final_error, max_steering
+
+grid = {'k01': [0.5, 1, 2],
+	'k02': [0.5, 1, 2],
+	'k12': [2, 5, 10],
+	'l': [0.3]}
+
+metrics = {'final_error': final_error, 'max_steering': max_steering}
+
+results = []
+for result in sweep(fb_scenario, grid=grid, metrics=metrics, chunksize=2):
+	print(result['index'], result['params'], result['metrics'])
+	results.append(result)
+	
+best = min(results, key=lambda result: result['metrics']['final_error'])
+print('best:', best['params'], best['metrics'])
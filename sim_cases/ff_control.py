@@ -61,18 +61,19 @@ def run_sim(model):
 	odefunction = lambda t, x : model.ode(t, x)
 	sim_params = get_sim_parameters()
 	sim = Simulation(sim_params)
-	return sim.simulate(odefunction)
+	return sim.simulate(odefunction, model.inputs, jac=model.jac, jac_sparsity=model.jac_sparsity)
 
 model = init_model()
 
 flo = generate_trajectory()
 model.controller = FeedForwardController(flo, model.params)
 
-tsim, xsim = run_sim(model)
+# the solver evaluates the feed-forward inputs at every stage, so the
+# reference is tabulated once over the horizon
+sim_params = get_sim_parameters()
+model.controller.ref.tabulate(sim_params.t0, sim_params.tf, 1e-3)
 
-usim = np.zeros([len(tsim),2])
-for i in range(0, len(tsim)):
-    usim[i] = model.controller.control(tsim[i], xsim[i])
+tsim, xsim, usim = run_sim(model)
 
 plot_data(tsim, xsim, usim)
 # car_animation(tsim, xsim, usim, model.params)
@@ -0,0 +1,78 @@
+# Feedback control of an ensemble of cars with perturbed initial states
+
+from car import Car
+from planner import PolynomialPlanner
+from controller import FeedbackController
+
+from model import Parameters
+from sim import EnsembleSimulation, plt
+
+import numpy as np
+from numpy import tan
+
+N = 1000 # number of cars
+
+def init_model():
+	model = Car()
+	model.set_params(l=0.3)
+	return model
+	
+def get_controller_params():
+	k = Parameters()
+	k.k01 = 1
+	k.k02 = 1
+	k.k12 = 5
+	return k
+	
+def get_sim_parameters():
+	rng = np.random.default_rng(0)
+	
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.04
+	sim_params.x0 = rng.normal(0, [0.3, 0.3, 0.2], size=(N, 3))
+	sim_params.xf = [5, 5, 0]
+	return sim_params
+	
+def generate_trajectory():
+	sim_params = get_sim_parameters()
+	
+	flo_f = PolynomialPlanner(np.array([0, tan(0), 0]),
+			np.array([sim_params.xf[1], tan(sim_params.xf[2]), 0]),
+			0,
+			sim_params.xf[0],
+			2)
+	flo_g = PolynomialPlanner(np.array([0, 0]),
+			np.array([sim_params.xf[0], 0]),
+			sim_params.t0 + 1,
+			sim_params.tf - 1,
+			1)
+	
+	return flo_f, flo_g
+
+def run_sim(model):
+	odefunction = lambda t, x : model.ode(t, x)
+	sim_params = get_sim_parameters()
+	sim = EnsembleSimulation(sim_params)
+	return sim.simulate(odefunction)
+
+model = init_model()
+
+flo = generate_trajectory()
+model.controller = FeedbackController(flo, model.params)
+model.controller.params.append(get_controller_params())
+
+# one table lookup per Runge-Kutta stage serves all cars of the fleet
+sim_params = get_sim_parameters()
+model.controller.ref.tabulate(sim_params.t0, sim_params.tf, 1e-3)
+
+tsim, xsim = run_sim(model)
+
+plt.figure()
+plt.plot(xsim[:, :, 0].T, xsim[:, :, 1].T, lw=0.5, color='b', alpha=0.1)
+plt.xlabel(r'$y_1$')
+plt.ylabel(r'$y_2$')
+plt.title('Ensemble of {} cars'.format(N))
+plt.grid(True)
+plt.show()
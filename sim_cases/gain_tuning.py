@@ -0,0 +1,68 @@
+# Tuning of the feedback gains with batched closed loop rollouts
+
+from car import Car
+from planner import PolynomialPlanner
+from controller import FeedbackController, GainTuner
+
+from model import Parameters
+from sim import Simulation, plt, plot_data
+
+import numpy as np
+from numpy import tan
+
+def init_model():
+	model = Car()
+	model.set_params(l=0.3)
+	return model
+	
+def get_controller_params():
+	k = Parameters()
+	k.k01 = 1
+	k.k02 = 1
+	k.k12 = 5
+	return k
+	
+def get_sim_parameters():
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.04
+	sim_params.x0 = [0, 0.5, 0]
+	sim_params.xf = [5, 5, 0]
+	return sim_params
+	
+def generate_trajectory():
+	sim_params = get_sim_parameters()
+	
+	flo_f = PolynomialPlanner(np.array([0, 0, 0]),
+			np.array([sim_params.xf[1], tan(sim_params.xf[2]), 0]),
+			0,
+			sim_params.xf[0],
+			2)
+	flo_g = PolynomialPlanner(np.array([0, 0]),
+			np.array([sim_params.xf[0], 0]),
+			sim_params.t0 + 1,
+			sim_params.tf - 1,
+			1)
+	
+	return flo_f, flo_g
+
+model = init_model()
+
+model.controller = FeedbackController(generate_trajectory(), model.params)
+model.controller.params.append(get_controller_params())
+
+# start away from the reference, limit the steering angle to 30 degrees
+tuner = GainTuner(model, get_sim_parameters(), u_max=(np.inf, np.deg2rad(30)))
+k0 = [model.controller.params.k01, model.controller.params.k02, model.controller.params.k12]
+print('initial gains:', k0, 'cost:', tuner.cost([k0])[0])
+
+gains, cost = tuner.optimize(k0, iterations=10)
+print('tuned gains:', gains, 'cost:', cost)
+
+model.controller.params.append(gains)
+sim = Simulation(get_sim_parameters())
+tsim, xsim, usim = sim.simulate(lambda t, x : model.ode(t, x), model.inputs)
+
+plot_data(tsim, xsim, usim)
+plt.show()
@@ -0,0 +1,59 @@
+# Time-varying LQR tracking control along the planned trajectory
+
+from car import Car, car_animation
+from planner import PolynomialPlanner
+from controller import LQRController
+
+from model import Parameters
+from sim import Simulation, plt, plot_data
+
+import numpy as np
+from numpy import tan
+
+def init_model():
+	model = Car()
+	model.set_params(l=0.3)
+	return model
+	
+def get_sim_parameters():
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.04
+	sim_params.x0 = [0, 0.5, 0]
+	sim_params.xf = [5, 5, 0]
+	return sim_params
+	
+def generate_trajectory():
+	sim_params = get_sim_parameters()
+	
+	flo_f = PolynomialPlanner(np.array([0, 0, 0]),
+			np.array([sim_params.xf[1], tan(sim_params.xf[2]), 0]),
+			0,
+			sim_params.xf[0],
+			2)
+	flo_g = PolynomialPlanner(np.array([0, 0]),
+			np.array([sim_params.xf[0], 0]),
+			sim_params.t0 + 1,
+			sim_params.tf - 1,
+			1)
+	
+	return flo_f, flo_g
+	
+def run_sim(model):
+	odefunction = lambda t, x : model.ode(t, x)
+	sim_params = get_sim_parameters()
+	sim = Simulation(sim_params)
+	return sim.simulate(odefunction, model.inputs)
+
+model = init_model()
+
+sim_params = get_sim_parameters()
+model.controller = LQRController(generate_trajectory(), model, sim_params.t0, sim_params.tf,
+	Q=np.diag([10, 10, 1]), R=np.diag([1, 1]))
+	
+tsim, xsim, usim = run_sim(model)
+
+plot_data(tsim, xsim, usim)
+car_animation(tsim, xsim, usim, model.params)
+plt.show()
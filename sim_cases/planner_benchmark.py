@@ -0,0 +1,49 @@
+# Benchmark - sampling a planned trajectory
+
+import numpy as np
+from planner import PolynomialPlanner
+from timeit import default_timer as timer
+
+# Start and end position
+YA = np.array([0, 0, 0])
+YB = np.array([1, 0, 0])
+t0 = 0
+tf = 1
+
+# Smoothness
+d = 2
+
+# Number of sample points
+N = 100000
+
+y_poly = PolynomialPlanner(YA, YB, t0, tf, d)
+tt = np.linspace(t0 - 0.1, tf + 0.1, N)
+
+def eval_loop(planner, tt):
+	"""Per-sample evaluation through the T matrix"""
+	Y = np.zeros([len(tt), planner.d + 1])
+	for i in range(0, len(tt)):
+		if tt[i] < planner.t0:
+			Y[i] = planner.YA
+		elif tt[i] > planner.tf:
+			Y[i] = planner.YB
+		else:
+			Y[i] = np.dot(planner.TMatrix(tt[i]), planner.c)
+	return Y
+
+def measure(fct, repeat=3):
+	best = np.inf
+	for i in range(0, repeat):
+		start = timer()
+		Y = fct()
+		best = min(best, timer() - start)
+	return best, Y
+
+t_loop, Y_loop = measure(lambda: eval_loop(y_poly, tt), repeat=1)
+t_vec, Y_vec = measure(lambda: y_poly.eval_vec(tt))
+
+print('samples:           {}'.format(N))
+print('per-sample loop:   {:.4f} s'.format(t_loop))
+print('eval_vec:          {:.4f} s'.format(t_vec))
+print('speedup:           {:.0f}x'.format(t_loop / t_vec))
+print('max. deviation:    {:.2e}'.format(np.max(np.abs(Y_loop - Y_vec))))
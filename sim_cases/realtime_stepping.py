@@ -0,0 +1,58 @@
+# Real-time stepping of the car with a 1 kHz control loop
+
+from car import Car
+from planner import PolynomialPlanner
+from controller import FeedbackController
+
+from model import Parameters
+from sim import Stepper, plt, plot_data
+
+import numpy as np
+from numpy import tan
+
+period = 1e-3 # control period in s
+
+def init_model():
+	model = Car()
+	model.set_params(l=0.3)
+	return model
+	
+def get_controller_params():
+	k = Parameters()
+	k.k01 = 1
+	k.k02 = 1
+	k.k12 = 5
+	return k
+	
+def generate_trajectory():
+	flo_f = PolynomialPlanner(np.array([0, tan(0), 0]), np.array([5, tan(0), 0]), 0, 5, 2)
+	flo_g = PolynomialPlanner(np.array([0, 0]), np.array([5, 0]), 1, 9, 1)
+	return flo_f, flo_g
+	
+model = init_model()
+controller = FeedbackController(generate_trajectory(), model.params)
+controller.params.append(get_controller_params())
+controller.ref.tabulate(0, 10, period)
+
+stepper = Stepper(model, period)
+stepper.reset([0, 0, 0])
+
+n = int(round(10 / period))
+tsim = np.zeros([n + 1])
+xsim = np.zeros([n + 1, 3])
+usim = np.zeros([n + 1, 2])
+xsim[0] = stepper.state
+for i in range(0, n + 1):
+	# the input is computed outside of the model, e.g. by the hardware
+	usim[i] = controller.control(stepper.t, xsim[i])
+	if i < n:
+		tsim[i + 1] = stepper.t + period
+		xsim[i + 1] = stepper.step(usim[i])
+		
+stats = stepper.stats()
+print('steps: {steps}, deadline misses: {misses}'.format(**stats))
+print('latency mean / p99 / max: {:.1f} / {:.1f} / {:.1f} us'.format(
+	1e6 * stats['mean'], 1e6 * stats['p99'], 1e6 * stats['max']))
+
+plot_data(tsim, xsim, usim)
+plt.show()
@@ -0,0 +1,61 @@
+# Feedback control with a sampled controller and zero-order hold
+
+from car import Car
+from planner import PolynomialPlanner
+from controller import FeedbackController
+
+from model import Parameters
+from sim import Simulation, plt, plot_data
+
+import numpy as np
+from numpy import tan
+
+Ts = 0.1 # sample time of the controller
+
+def init_model():
+	model = Car()
+	model.set_params(l=0.3)
+	return model
+	
+def get_controller_params():
+	k = Parameters()
+	k.k01 = 1
+	k.k02 = 1
+	k.k12 = 5
+	return k
+	
+def get_sim_parameters():
+	sim_params = Parameters()
+	sim_params.t0 = 0
+	sim_params.tf = 10
+	sim_params.dt = 0.01
+	sim_params.x0 = [0,0,0]
+	sim_params.xf = [5, 5, 0]
+	return sim_params
+	
+def generate_trajectory():
+	sim_params = get_sim_parameters()
+	
+	flo_f = PolynomialPlanner(np.array([sim_params.x0[1], tan(sim_params.x0[2]), 0]),
+			np.array([sim_params.xf[1], tan(sim_params.xf[2]), 0]),
+			sim_params.x0[0],
+			sim_params.xf[0],
+			2)
+	flo_g = PolynomialPlanner(np.array([sim_params.x0[0], 0]),
+			np.array([sim_params.xf[0], 0]),
+			sim_params.t0 + 1,
+			sim_params.tf - 1,
+			1)
+	
+	return flo_f, flo_g
+
+model = init_model()
+
+model.controller = FeedbackController(generate_trajectory(), model.params)
+model.controller.params.append(get_controller_params())
+
+sim = Simulation(get_sim_parameters())
+tsim, xsim, usim = sim.simulate_sampled(model, Ts)
+
+plot_data(tsim, xsim, usim)
+plt.show()